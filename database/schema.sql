@@ -206,7 +206,8 @@ CREATE TABLE public.assessment_attempts (
 CREATE INDEX idx_attempts_assessment ON public.assessment_attempts(assessment_id);
 CREATE INDEX idx_attempts_user ON public.assessment_attempts(user_id);
 CREATE INDEX idx_attempts_email ON public.assessment_attempts(user_email);
-CREATE INDEX idx_attempts_typeform ON public.assessment_attempts(typeform_response_id);
+-- Unique so the migration can upsert attempts with on_conflict=typeform_response_id
+CREATE UNIQUE INDEX idx_attempts_typeform ON public.assessment_attempts(typeform_response_id);
 
 -- ============================================
 -- 7. RESPONSES (Individual Answers)
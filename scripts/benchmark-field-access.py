@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Micro-benchmark per-item field access on a synthetic WordPress export.
+
+The reference path reads every post, postmeta and comment field the way the
+converters used to: one namespaced `findtext` per field, each resolved by
+ElementPath. The indexed path scans each element's children once into a
+ChildFields map and reads the fields from it. Both paths read the same
+fields and must return identical values.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Callable
+from pathlib import Path
+
+from wxr.posts import extract_meta
+from wxr.reader import NAMESPACES, ChildFields, get_channel, get_child_text, load_xml
+from wxr.synthetic import SyntheticExport, write_synthetic_export
+
+ITEM_FIELDS = (
+    "wp:post_type",
+    "wp:post_id",
+    "wp:post_name",
+    "title",
+    "excerpt:encoded",
+    "content:encoded",
+    "dc:creator",
+    "wp:status",
+    "wp:post_date",
+    "pubDate",
+    "wp:post_modified_gmt",
+)
+COMMENT_FIELDS = (
+    "wp:comment_type",
+    "wp:comment_content",
+    "wp:comment_id",
+    "wp:comment_parent",
+    "wp:comment_approved",
+    "wp:comment_date_gmt",
+    "wp:comment_date",
+    "wp:comment_author",
+    "wp:comment_author_email",
+    "wp:comment_author_url",
+    "wp:comment_author_IP",
+    "wp:comment_agent",
+)
+
+ItemFields = tuple[list[str], dict[str, str], list[list[str]]]
+
+
+def reference_meta(item: ET.Element) -> dict[str, str]:
+    meta: dict[str, str] = {}
+    for meta_node in item.iterfind("wp:postmeta", namespaces=NAMESPACES):
+        key = meta_node.findtext("wp:meta_key", namespaces=NAMESPACES)
+        if not key:
+            continue
+        value = meta_node.findtext("wp:meta_value", namespaces=NAMESPACES)
+        if value is not None:
+            meta[key] = value
+    return meta
+
+
+def run_reference(items: list[ET.Element]) -> list[ItemFields]:
+    results: list[ItemFields] = []
+    for item in items:
+        values = [get_child_text(item, tag) for tag in ITEM_FIELDS]
+        comments = [
+            [get_child_text(comment, tag) for tag in COMMENT_FIELDS]
+            for comment in item.findall("wp:comment", namespaces=NAMESPACES)
+        ]
+        results.append((values, reference_meta(item), comments))
+    return results
+
+
+def run_indexed(items: list[ET.Element]) -> list[ItemFields]:
+    results: list[ItemFields] = []
+    for item in items:
+        field = ChildFields(item)
+        values = [field(tag) for tag in ITEM_FIELDS]
+        comments = []
+        for comment in item.findall("wp:comment", namespaces=NAMESPACES):
+            comment_field = ChildFields(comment)
+            comments.append([comment_field(tag) for tag in COMMENT_FIELDS])
+        results.append((values, extract_meta(item), comments))
+    return results
+
+
+def best_of(repeat: int, run: Callable, items: list[ET.Element]) -> tuple[float, list[ItemFields]]:
+    best = float("inf")
+    result: list[ItemFields] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run(items)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, help="existing WXR export to use instead of a synthetic one")
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--comments-per-post", type=int, default=3)
+    parser.add_argument("--meta-per-item", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = args.input
+        if path is None:
+            spec = SyntheticExport(
+                items=args.items,
+                comments_per_post=args.comments_per_post,
+                meta_per_item=args.meta_per_item,
+                seed=args.seed,
+            )
+            path = write_synthetic_export(Path(work_dir) / spec.filename, spec)
+        items = get_channel(load_xml(path)).findall("item")
+
+    reference_seconds, reference = best_of(args.repeat, run_reference, items)
+    indexed_seconds, indexed = best_of(args.repeat, run_indexed, items)
+
+    report = {
+        "items": len(items),
+        "comments": sum(len(comments) for _, _, comments in indexed),
+        "reference_seconds": round(reference_seconds, 4),
+        "indexed_seconds": round(indexed_seconds, 4),
+        "speedup": round(reference_seconds / indexed_seconds, 2),
+        "reference_per_item_us": round(reference_seconds / len(items) * 1e6, 2),
+        "indexed_per_item_us": round(indexed_seconds / len(items) * 1e6, 2),
+        "identical": reference == indexed,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["identical"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
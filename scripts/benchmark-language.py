@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Micro-benchmark post language detection against the original function.
+
+The reference path is a frozen copy of the detect_language that
+generate-posts-from-xml.py shipped: it joins categories, tags, slug and
+title, lowercases the result and checks every token of each language in
+turn. The detector path is wxr.language, which ranks each category/tag
+combination once and only checks the slug and title per post. A fresh
+detector is built for every timed run, so its caches are filled inside the
+measurement.
+
+Posts come from an existing posts.json (--input, replicated --replicate
+times, as a full export repeats the same taxonomy combinations) or are
+synthesized from the category names of wxr.synthetic.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from wxr.language import LanguageDetector
+from wxr.synthetic import CATEGORIES
+
+PostFields = tuple[list[str], list[str], str, str]
+
+TITLE_WORDS = ("implant", "case", "bone", "graft", "Spanish", "chino", "periodontal", "review", "guía", "中文")
+
+
+def reference_detect_language(categories: list[str], tags: list[str], slug: str, title: str) -> str:
+    combined = " ".join(categories + tags + [slug, title]).lower()
+    if any(token in combined for token in ["espanol", "español", "spanish"]):
+        return "es"
+    if any(token in combined for token in ["portugues", "português", "portuguese"]):
+        return "pt"
+    if any(token in combined for token in ["chinese", "中文", "chino"]):
+        return "zh"
+    return "en"
+
+
+def run_reference(posts: list[PostFields]) -> list[str]:
+    return [reference_detect_language(*post) for post in posts]
+
+
+def run_detector(posts: list[PostFields]) -> list[str]:
+    detect = LanguageDetector().detect
+    return [detect(*post) for post in posts]
+
+
+def load_posts(path: Path, replicate: int) -> list[PostFields]:
+    records = json.loads(path.read_text(encoding="utf-8"))
+    posts = [
+        (list(record.get("categories") or []), list(record.get("tags") or []), record["slug"], record["title"])
+        for record in records
+    ]
+    return posts * replicate
+
+
+def synthetic_posts(count: int, seed: int) -> list[PostFields]:
+    rng = random.Random(seed)
+    posts: list[PostFields] = []
+    for index in range(count):
+        words = rng.sample(TITLE_WORDS, k=4)
+        title = " ".join(words).capitalize() + f" {index}"
+        slug = "-".join(words).lower() + f"-{index}"
+        posts.append(([rng.choice(CATEGORIES)], [f"tag-{index % 25}"], slug, title))
+    return posts
+
+
+def best_of(repeat: int, run: Callable, posts: list[PostFields]) -> tuple[float, list[str]]:
+    best = float("inf")
+    result: list[str] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run(posts)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, help="posts.json to take categories, tags, slugs and titles from")
+    parser.add_argument("--replicate", type=int, default=200, help="copies of --input to run (default: 200)")
+    parser.add_argument("--posts", type=int, default=20_000, help="synthetic posts when --input is not given")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    posts = load_posts(args.input, args.replicate) if args.input else synthetic_posts(args.posts, args.seed)
+
+    reference_seconds, reference = best_of(args.repeat, run_reference, posts)
+    detector_seconds, detected = best_of(args.repeat, run_detector, posts)
+
+    report = {
+        "posts": len(posts),
+        "reference_seconds": round(reference_seconds, 4),
+        "detector_seconds": round(detector_seconds, 4),
+        "speedup": round(reference_seconds / detector_seconds, 2),
+        "reference_per_post_us": round(reference_seconds / len(posts) * 1e6, 2),
+        "detector_per_post_us": round(detector_seconds / len(posts) * 1e6, 2),
+        "identical": reference == detected,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["identical"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Measure how post extraction scales with --workers on a WordPress export.xml."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from wxr import iter_items, iter_posts
+from wxr.parallel import iter_posts_parallel
+
+
+def digest(posts: list[dict[str, object]]) -> str:
+    encoded = json.dumps(posts, ensure_ascii=False, indent=2).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", type=Path)
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)),
+        help="comma-separated worker counts to measure (default: powers of two up to the CPU count)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N timing per point")
+    parser.add_argument("--json", type=Path, help="also write the results as JSON to this path")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    input_path: Path = args.input
+    if not input_path.exists():
+        print(f"Input XML not found: {input_path}")
+        return 1
+
+    def serial() -> list[dict[str, object]]:
+        return list(iter_posts(iter_items(input_path)))
+
+    def parallel(workers: int):
+        return lambda: list(iter_posts_parallel(input_path, workers))
+
+    runs = [("serial", serial)] + [
+        (f"workers={n}", parallel(n)) for n in (int(value) for value in args.workers.split(","))
+    ]
+
+    results = []
+    baseline_seconds = 0.0
+    baseline_digest = ""
+    for label, run in runs:
+        best = float("inf")
+        posts: list[dict[str, object]] = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            posts = run()
+            best = min(best, time.perf_counter() - started)
+        output_digest = digest(posts)
+        if label == "serial":
+            baseline_seconds = best
+            baseline_digest = output_digest
+        results.append(
+            {
+                "mode": label,
+                "posts": len(posts),
+                "seconds": round(best, 3),
+                "speedup": round(baseline_seconds / best, 2),
+                "identical": output_digest == baseline_digest,
+            }
+        )
+        print(f"{label:>12}  {best:8.3f}s  x{baseline_seconds / best:5.2f}  identical={output_digest == baseline_digest}")
+
+    if args.json:
+        report = {"input": str(input_path), "cpu_count": os.cpu_count(), "results": results}
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
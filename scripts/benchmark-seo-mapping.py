@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Micro-benchmark postmeta filtering and SEO building on a synthetic corpus.
+
+Every synthetic post carries --meta-per-post postmeta rows: the Yoast keys
+the site actually uses plus Elementor/plugin junk. The reference path is a
+frozen copy of the extract_meta/build_seo that generate-posts-from-xml.py
+shipped before the table-driven mapping: it reads every row into a dict with
+findall/findtext and probes it once per Yoast key. The compiled path keeps
+only the wanted keys and builds from those.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import xml.etree.ElementTree as ET
+
+from wxr.posts import extract_meta
+from wxr.reader import NAMESPACES
+from wxr.seo import DEFAULT_SEO_PLUGINS, YOAST_SEO_FIELDS, build_seo, parse_json_meta, seo_plugins_arg
+
+WP = NAMESPACES["wp"]
+JUNK_PREFIXES = ("_elementor_", "_wpb_", "us_", "_oembed_", "patreon-", "_wpassetcleanup_", "hefo_")
+
+
+def make_item(rng: random.Random, meta_per_post: int) -> ET.Element:
+    item = ET.Element("item")
+    rows: list[tuple[str, str]] = [("_thumbnail_id", str(rng.randint(1, 10_000)))]
+    for meta_key, _, parser in rng.sample(YOAST_SEO_FIELDS, k=min(15, len(YOAST_SEO_FIELDS))):
+        value = '[{"keyword": "implant", "score": 60}]' if parser else f"value {rng.random():.6f}"
+        rows.append((meta_key, value))
+    while len(rows) < meta_per_post:
+        rows.append((f"{rng.choice(JUNK_PREFIXES)}{len(rows)}", "x" * rng.randint(10, 400)))
+    rng.shuffle(rows)
+    for key, value in rows:
+        meta = ET.SubElement(item, f"{{{WP}}}postmeta")
+        ET.SubElement(meta, f"{{{WP}}}meta_key").text = key
+        ET.SubElement(meta, f"{{{WP}}}meta_value").text = value
+    return item
+
+
+def reference_extract_meta(item: ET.Element) -> dict[str, str]:
+    meta: dict[str, str] = {}
+    for meta_node in item.findall("wp:postmeta", namespaces=NAMESPACES):
+        key = meta_node.findtext("wp:meta_key", namespaces=NAMESPACES)
+        value = meta_node.findtext("wp:meta_value", namespaces=NAMESPACES)
+        if key and value is not None:
+            meta[key] = value
+    return meta
+
+
+def reference_build_seo(meta: dict[str, str]) -> dict[str, object]:
+    seo: dict[str, object] = {}
+
+    def set_if_present(key: str, value: object) -> None:
+        if value not in ("", None, [], {}):
+            seo[key] = value
+
+    set_if_present("title", meta.get("_yoast_wpseo_title", ""))
+    set_if_present("description", meta.get("_yoast_wpseo_metadesc", ""))
+    set_if_present("focus_keyword", meta.get("_yoast_wpseo_focuskw", ""))
+    set_if_present("focus_keywords", parse_json_meta(meta.get("_yoast_wpseo_focuskeywords", "")))
+    set_if_present("keyword_synonyms", parse_json_meta(meta.get("_yoast_wpseo_keywordsynonyms", "")))
+    set_if_present("content_score", meta.get("_yoast_wpseo_content_score", ""))
+    set_if_present("linkdex", meta.get("_yoast_wpseo_linkdex", ""))
+    set_if_present(
+        "estimated_reading_time_minutes",
+        meta.get("_yoast_wpseo_estimated-reading-time-minutes", ""),
+    )
+
+    set_if_present("og_title", meta.get("_yoast_wpseo_opengraph-title", ""))
+    set_if_present("og_description", meta.get("_yoast_wpseo_opengraph-description", ""))
+    set_if_present("og_image", meta.get("_yoast_wpseo_opengraph-image", ""))
+    set_if_present("og_image_id", meta.get("_yoast_wpseo_opengraph-image-id", ""))
+
+    set_if_present("twitter_title", meta.get("_yoast_wpseo_twitter-title", ""))
+    set_if_present("twitter_description", meta.get("_yoast_wpseo_twitter-description", ""))
+    set_if_present("twitter_image", meta.get("_yoast_wpseo_twitter-image", ""))
+    set_if_present("twitter_image_id", meta.get("_yoast_wpseo_twitter-image-id", ""))
+
+    set_if_present("canonical", meta.get("_yoast_wpseo_canonical", ""))
+    set_if_present("redirect", meta.get("_yoast_wpseo_redirect", ""))
+    set_if_present("meta_robots", meta.get("_yoast_wpseo_meta-robots", ""))
+    set_if_present("meta_robots_noindex", meta.get("_yoast_wpseo_meta-robots-noindex", ""))
+    set_if_present("meta_robots_nofollow", meta.get("_yoast_wpseo_meta-robots-nofollow", ""))
+    set_if_present("meta_robots_adv", meta.get("_yoast_wpseo_meta-robots-adv", ""))
+
+    return seo
+
+
+def run_reference(items: list[ET.Element]) -> list[dict[str, object]]:
+    return [reference_build_seo(reference_extract_meta(item)) for item in items]
+
+
+def run_compiled(items: list[ET.Element]) -> list[dict[str, object]]:
+    # Built the way --seo-plugins builds it, not the module default.
+    mapping = seo_plugins_arg(",".join(DEFAULT_SEO_PLUGINS))
+    return [build_seo(extract_meta(item, mapping.meta_keys), mapping) for item in items]
+
+
+def best_of(repeat: int, run, items: list[ET.Element]) -> tuple[float, list[dict[str, object]]]:
+    best = float("inf")
+    result: list[dict[str, object]] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run(items)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=20_000)
+    parser.add_argument("--meta-per-post", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    items = [make_item(rng, args.meta_per_post) for _ in range(args.posts)]
+
+    reference_seconds, reference = best_of(args.repeat, run_reference, items)
+    compiled_seconds, compiled = best_of(args.repeat, run_compiled, items)
+
+    report = {
+        "posts": args.posts,
+        "meta_per_post": args.meta_per_post,
+        "reference_seconds": round(reference_seconds, 4),
+        "compiled_seconds": round(compiled_seconds, 4),
+        "speedup": round(reference_seconds / compiled_seconds, 2),
+        "per_post_us": round(compiled_seconds / args.posts * 1e6, 2),
+        "identical": reference == compiled,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["identical"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Time and memory-profile the WXR converters on synthetic WordPress exports.
+
+Every measurement runs in a fresh interpreter, so peak RSS belongs to that
+target alone. Results are written as JSON. Pass --compare with an earlier
+results file to flag regressions between changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from wxr import (
+    extract_comments,
+    extract_comments_streaming,
+    extract_posts,
+    extract_posts_streaming,
+    get_channel,
+    load_xml,
+)
+from wxr.synthetic import SyntheticExport, write_synthetic_export
+
+
+def _load(path: Path) -> tuple[Callable[[], int]]:
+    return (lambda: len(get_channel(load_xml(path)).findall("item")),)
+
+
+def _dom(extract: Callable) -> Callable[[Path], tuple[Callable[[], int]]]:
+    def prepare(path: Path) -> tuple[Callable[[], int]]:
+        channel = get_channel(load_xml(path))
+        return (lambda: len(extract(channel)),)
+
+    return prepare
+
+
+def _streaming(extract: Callable) -> Callable[[Path], tuple[Callable[[], int]]]:
+    def prepare(path: Path) -> tuple[Callable[[], int]]:
+        return (lambda: len(extract(path)),)
+
+    return prepare
+
+
+# Each target prepares its input outside the timed region and returns the
+# timed callable, which reports how many records it produced.
+TARGETS: dict[str, Callable[[Path], tuple[Callable[[], int]]]] = {
+    "load_xml": _load,
+    "extract_posts": _dom(extract_posts),
+    "extract_comments": _dom(extract_comments),
+    "extract_posts_streaming": _streaming(extract_posts_streaming),
+    "extract_comments_streaming": _streaming(extract_comments_streaming),
+}
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(target: str, path: Path) -> dict[str, object]:
+    (run,) = TARGETS[target](path)
+    started = time.perf_counter()
+    records = run()
+    seconds = time.perf_counter() - started
+    return {"seconds": seconds, "records": records, "peak_rss_mb": peak_rss_mb()}
+
+
+def run_isolated(target: str, path: Path) -> dict[str, object]:
+    completed = subprocess.run(
+        [sys.executable, __file__, "--measure", target, str(path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def compare(results: list[dict[str, object]], baseline_path: Path, threshold: float) -> list[str]:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(row["target"], row["items"]): row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        before = previous.get((row["target"], row["items"]))
+        if before is None:
+            continue
+        for metric in ("seconds", "peak_rss_mb"):
+            if before[metric] and row[metric] > before[metric] * (1 + threshold):
+                change = row[metric] / before[metric] - 1
+                regressions.append(
+                    f"{row['target']} @ {row['items']} items: {metric} "
+                    f"{before[metric]} -> {row[metric]} (+{change:.0%})"
+                )
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated item counts")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="comma-separated targets to run")
+    parser.add_argument("--comments-per-post", type=int, default=3)
+    parser.add_argument("--meta-per-item", type=int, default=20)
+    parser.add_argument("--attachment-ratio", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N timing per point")
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "periospot-wxr-bench",
+        help="where synthetic exports are generated and reused",
+    )
+    parser.add_argument("--output", type=Path, default=Path("wxr-benchmark.json"))
+    parser.add_argument("--compare", type=Path, help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging")
+    parser.add_argument("--measure", nargs=2, metavar=("TARGET", "EXPORT"), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.measure:
+        target, export = args.measure
+        print(json.dumps(measure(target, Path(export))))
+        return 0
+
+    targets = [name.strip() for name in args.targets.split(",") if name.strip()]
+    unknown = [name for name in targets if name not in TARGETS]
+    if unknown:
+        print(f"Unknown targets: {', '.join(unknown)} (choose from {', '.join(TARGETS)})")
+        return 1
+
+    results: list[dict[str, object]] = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        spec = SyntheticExport(
+            items=size,
+            comments_per_post=args.comments_per_post,
+            meta_per_item=args.meta_per_item,
+            attachment_ratio=args.attachment_ratio,
+        )
+        export_path = args.work_dir / spec.filename
+        if not export_path.exists():
+            print(f"Generating {export_path} ...")
+            write_synthetic_export(export_path, spec)
+        export_mb = export_path.stat().st_size / (1024 * 1024)
+
+        for target in targets:
+            runs = [run_isolated(target, export_path) for _ in range(args.repeat)]
+            row = {
+                "target": target,
+                "items": size,
+                "export_mb": round(export_mb, 1),
+                "records": runs[0]["records"],
+                "seconds": round(min(run["seconds"] for run in runs), 4),
+                "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+            }
+            results.append(row)
+            print(
+                f"{target:>28} {size:>8} items  {row['seconds']:9.3f}s  "
+                f"{row['peak_rss_mb']:8.1f} MB peak  ({row['records']} records)"
+            )
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "comments_per_post": args.comments_per_post,
+            "meta_per_item": args.meta_per_item,
+            "attachment_ratio": args.attachment_ratio,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results -> {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
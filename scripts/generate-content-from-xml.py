@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Generate every legacy-wordpress/content JSON file from one parse of export.xml."""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import ExitStack
+from pathlib import Path
+
+from wxr import SINKS, TeeWriter, extract_all, load_rewriter, open_store, open_writer, output_path_for
+from wxr.seo import DEFAULT_SEO_PLUGINS, SEO_PLUGIN_TABLES, seo_plugins_arg
+from wxr.store import SCHEMAS
+
+# Sinks that build an `seo` block and so take the --seo-plugins mapping.
+SEO_SINKS = ("posts", "pages")
+
+
+def parse_args() -> argparse.Namespace:
+    root_dir = Path.cwd()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "input",
+        nargs="?",
+        type=Path,
+        default=root_dir / "legacy-wordpress" / "export.xml",
+    )
+    parser.add_argument(
+        "output_dir",
+        nargs="?",
+        type=Path,
+        default=root_dir / "legacy-wordpress" / "content",
+    )
+    parser.add_argument(
+        "--only",
+        default=",".join(SINKS),
+        help=f"comma-separated outputs to write (default: {','.join(SINKS)})",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="write JSON Lines (.jsonl) instead of indented JSON arrays",
+    )
+    parser.add_argument(
+        "--sqlite",
+        type=Path,
+        metavar="PATH",
+        help="also load the posts and comments into an indexed SQLite database at PATH",
+    )
+    parser.add_argument(
+        "--rewrite-urls",
+        nargs="?",
+        type=Path,
+        const=root_dir / "image-migration-mappings.json",
+        metavar="MAPPINGS",
+        help="replace migrated media URLs in posts (content, featured_image and SEO images) using an "
+        "old->new URL JSON map (default: image-migration-mappings.json)",
+    )
+    parser.add_argument(
+        "--seo-plugins",
+        type=seo_plugins_arg,
+        default=",".join(DEFAULT_SEO_PLUGINS),
+        metavar="NAMES",
+        help="comma-separated SEO plugins whose postmeta fills `seo`, earliest first "
+        f"(choose from {','.join(SEO_PLUGIN_TABLES)}; default: {','.join(DEFAULT_SEO_PLUGINS)})",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    input_path: Path = args.input
+    output_dir: Path = args.output_dir
+
+    if not input_path.exists():
+        print(f"Input XML not found: {input_path}")
+        return 1
+
+    names = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SINKS]
+    if unknown:
+        print(f"Unknown outputs: {', '.join(unknown)} (choose from {', '.join(SINKS)})")
+        return 1
+
+    rewriter = load_rewriter(args.rewrite_urls) if args.rewrite_urls else None
+    stored = tuple(name for name in names if name in SCHEMAS)
+    with ExitStack() as stack:
+        store = stack.enter_context(open_store(args.sqlite, stored)) if args.sqlite and stored else {}
+        outputs = []
+        for name in names:
+            sink_class = SINKS[name]
+            output_path = output_path_for(output_dir / sink_class.filename, args.jsonl)
+            writer = stack.enter_context(open_writer(output_path, jsonl=args.jsonl))
+            if name in store:
+                writer = TeeWriter(writer, store[name])
+            options = {"seo_mapping": args.seo_plugins} if name in SEO_SINKS else {}
+            if name == "posts":
+                options["rewriter"] = rewriter
+            outputs.append((name, sink_class(writer, **options), output_path))
+        extract_all(input_path, [sink for _, sink, _ in outputs])
+
+    for name, sink, output_path in outputs:
+        print(f"Generated {sink.count} {name} -> {output_path}")
+    if rewriter and "posts" in names:
+        print(
+            f"Rewrote {rewriter.replacements} URLs in {rewriter.posts_changed} posts "
+            f"({len(rewriter.targets)} mappings)"
+        )
+    if store:
+        print(f"Indexed {', '.join(store)} -> {args.sqlite}")
+        if "posts" in store and store["posts"].full_text_error:
+            print(f"Skipping full-text index: {store['posts'].full_text_error}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,217 +3,224 @@
 
 from __future__ import annotations
 
-import json
-import sys
+import argparse
+from collections import Counter
+from collections.abc import Iterable
+from contextlib import ExitStack
 from pathlib import Path
-import xml.etree.ElementTree as ET
-
-NAMESPACES = {
-    "content": "http://purl.org/rss/1.0/modules/content/",
-    "excerpt": "http://purl.org/rss/1.0/modules/excerpt/",
-    "dc": "http://purl.org/dc/elements/1.1/",
-    "wp": "http://wordpress.org/export/1.2/",
-}
-
-for prefix, uri in NAMESPACES.items():
-    ET.register_namespace(prefix, uri)
-
-
-def detect_language(categories: list[str], tags: list[str], slug: str, title: str) -> str:
-    combined = " ".join(categories + tags + [slug, title]).lower()
-    if any(token in combined for token in ["espanol", "español", "spanish"]):
-        return "es"
-    if any(token in combined for token in ["portugues", "português", "portuguese"]):
-        return "pt"
-    if any(token in combined for token in ["chinese", "中文", "chino"]):
-        return "zh"
-    return "en"
-
-
-def text_or_empty(value: str | None) -> str:
-    return value if value is not None else ""
-
-
-def get_child_text(item: ET.Element, tag: str) -> str:
-    return text_or_empty(item.findtext(tag, namespaces=NAMESPACES))
-
-
-def load_xml(path: Path) -> ET.Element:
-    raw = path.read_text(encoding="utf-8", errors="ignore")
-    start_index = raw.find("<?xml")
-    if start_index == -1:
-        raise ValueError("XML declaration not found in export file")
-    trimmed = raw[start_index:]
-    return ET.fromstring(trimmed)
-
-
-def get_channel(root: ET.Element) -> ET.Element:
-    channel = root.find("channel")
-    if channel is None:
-        raise ValueError("Invalid WordPress export: missing channel")
-    return channel
-
-
-def build_attachment_index(items: list[ET.Element]) -> dict[str, str]:
-    attachments: dict[str, str] = {}
-    for item in items:
-        post_type = get_child_text(item, "wp:post_type")
-        if post_type != "attachment":
-            continue
-        post_id = get_child_text(item, "wp:post_id")
-        url = get_child_text(item, "wp:attachment_url")
-        if post_id and url:
-            attachments[post_id] = url
-    return attachments
-
-
-def extract_categories(item: ET.Element) -> tuple[list[str], list[str]]:
-    categories: list[str] = []
-    tags: list[str] = []
-    for category in item.findall("category"):
-        domain = category.get("domain", "")
-        name = text_or_empty(category.text).strip()
-        if not name:
-            continue
-        if domain == "category":
-            categories.append(name)
-        elif domain == "post_tag":
-            tags.append(name)
-    return categories, tags
-
-
-def extract_meta(item: ET.Element) -> dict[str, str]:
-    meta: dict[str, str] = {}
-    for meta_node in item.findall("wp:postmeta", namespaces=NAMESPACES):
-        key = meta_node.findtext("wp:meta_key", namespaces=NAMESPACES)
-        value = meta_node.findtext("wp:meta_value", namespaces=NAMESPACES)
-        if key and value is not None:
-            meta[key] = value
-    return meta
-
-
-def parse_json_meta(value: str) -> object:
-    value = value.strip()
-    if not value:
-        return ""
-    if value.startswith("{") or value.startswith("["):
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return value
-    return value
-
-
-def build_seo(meta: dict[str, str]) -> dict[str, object]:
-    seo: dict[str, object] = {}
-
-    def set_if_present(key: str, value: object) -> None:
-        if value not in ("", None, [], {}):
-            seo[key] = value
-
-    set_if_present("title", meta.get("_yoast_wpseo_title", ""))
-    set_if_present("description", meta.get("_yoast_wpseo_metadesc", ""))
-    set_if_present("focus_keyword", meta.get("_yoast_wpseo_focuskw", ""))
-    set_if_present("focus_keywords", parse_json_meta(meta.get("_yoast_wpseo_focuskeywords", "")))
-    set_if_present("keyword_synonyms", parse_json_meta(meta.get("_yoast_wpseo_keywordsynonyms", "")))
-    set_if_present("content_score", meta.get("_yoast_wpseo_content_score", ""))
-    set_if_present("linkdex", meta.get("_yoast_wpseo_linkdex", ""))
-    set_if_present(
-        "estimated_reading_time_minutes",
-        meta.get("_yoast_wpseo_estimated-reading-time-minutes", ""),
-    )
 
-    set_if_present("og_title", meta.get("_yoast_wpseo_opengraph-title", ""))
-    set_if_present("og_description", meta.get("_yoast_wpseo_opengraph-description", ""))
-    set_if_present("og_image", meta.get("_yoast_wpseo_opengraph-image", ""))
-    set_if_present("og_image_id", meta.get("_yoast_wpseo_opengraph-image-id", ""))
-
-    set_if_present("twitter_title", meta.get("_yoast_wpseo_twitter-title", ""))
-    set_if_present("twitter_description", meta.get("_yoast_wpseo_twitter-description", ""))
-    set_if_present("twitter_image", meta.get("_yoast_wpseo_twitter-image", ""))
-    set_if_present("twitter_image_id", meta.get("_yoast_wpseo_twitter-image-id", ""))
-
-    set_if_present("canonical", meta.get("_yoast_wpseo_canonical", ""))
-    set_if_present("redirect", meta.get("_yoast_wpseo_redirect", ""))
-    set_if_present("meta_robots", meta.get("_yoast_wpseo_meta-robots", ""))
-    set_if_present("meta_robots_noindex", meta.get("_yoast_wpseo_meta-robots-noindex", ""))
-    set_if_present("meta_robots_nofollow", meta.get("_yoast_wpseo_meta-robots-nofollow", ""))
-    set_if_present("meta_robots_adv", meta.get("_yoast_wpseo_meta-robots-adv", ""))
-
-    return seo
-
-
-def extract_posts(channel: ET.Element) -> list[dict[str, object]]:
-    items = channel.findall("item")
-    attachments = build_attachment_index(items)
-    posts: list[dict[str, object]] = []
-
-    for item in items:
-        post_type = get_child_text(item, "wp:post_type")
-        if post_type != "post":
-            continue
-
-        wordpress_id = get_child_text(item, "wp:post_id")
-        slug = get_child_text(item, "wp:post_name")
-        title = text_or_empty(item.findtext("title"))
-        excerpt = get_child_text(item, "excerpt:encoded")
-        content = get_child_text(item, "content:encoded")
-        author = get_child_text(item, "dc:creator")
-        status = get_child_text(item, "wp:status") or "publish"
-        published_at = get_child_text(item, "wp:post_date") or get_child_text(item, "pubDate")
-
-        categories, tags = extract_categories(item)
-        meta = extract_meta(item)
-        seo = build_seo(meta)
-        thumbnail_id = meta.get("_thumbnail_id", "")
-        featured_image = attachments.get(thumbnail_id, "")
-        language = detect_language(categories, tags, slug, title)
-
-        post: dict[str, object] = {
-            "id": int(wordpress_id) if wordpress_id.isdigit() else wordpress_id,
-            "title": title,
-            "slug": slug,
-            "content": content,
-            "excerpt": excerpt,
-            "author": author,
-            "date": published_at,
-            "status": status,
-            "categories": categories,
-            "tags": tags,
-            "featured_image": featured_image,
-            "language": language,
-        }
-
-        if seo:
-            post["seo"] = seo
-
-        posts.append(post)
-
-    return posts
+from wxr import (
+    TeeWriter,
+    UrlRewriter,
+    get_channel,
+    iter_items,
+    iter_posts,
+    load_rewriter,
+    load_xml,
+    open_store,
+    open_writer,
+    output_path_for,
+)
+from wxr.artifacts import MANIFEST_NAME, open_artifact
+from wxr.incremental import (
+    cache_path_for,
+    iter_posts_incremental,
+    load_manifest,
+    manifest_options,
+    manifest_path_for,
+    open_record_cache,
+    save_manifest,
+)
+from wxr.parallel import iter_posts_parallel
+from wxr.seo import DEFAULT_SEO_PLUGINS, SEO_PLUGIN_TABLES, seo_plugins_arg
+from wxr.shards import DEFAULT_PAGE_SIZE, check_shards_dir, open_shards
+
+
+def parse_args() -> argparse.Namespace:
+    root_dir = Path.cwd()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "input",
+        nargs="?",
+        type=Path,
+        default=root_dir / "legacy-wordpress" / "export.xml",
+    )
+    parser.add_argument(
+        "output",
+        nargs="?",
+        type=Path,
+        default=root_dir / "legacy-wordpress" / "content" / "posts.json",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="parse the export incrementally, one <item> at a time",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="build posts on N processes (implies streaming input; output is identical)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="re-extract only posts whose <item> changed since the last run; always streams the "
+        "export (--stream is implied) and cannot be combined with --workers",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="write JSON Lines (one record per line) to <output>.jsonl",
+    )
+    parser.add_argument(
+        "--sqlite",
+        type=Path,
+        metavar="PATH",
+        help="also load the posts into an indexed SQLite database at PATH",
+    )
+    parser.add_argument(
+        "--rewrite-urls",
+        nargs="?",
+        type=Path,
+        const=root_dir / "image-migration-mappings.json",
+        metavar="MAPPINGS",
+        help="replace migrated media URLs in content, featured_image and SEO images using an "
+        "old->new URL JSON map (default: image-migration-mappings.json)",
+    )
+    parser.add_argument(
+        "--artifacts",
+        action="store_true",
+        help="also write content-hashed gzip/brotli/zstd variants listed in artifacts.json; "
+        "an unchanged output is not rewritten",
+    )
+    parser.add_argument(
+        "--shards",
+        type=Path,
+        metavar="DIR",
+        help="also write a listing manifest, per-language pages and per-id content files to DIR",
+    )
+    parser.add_argument(
+        "--seo-plugins",
+        type=seo_plugins_arg,
+        default=",".join(DEFAULT_SEO_PLUGINS),
+        metavar="NAMES",
+        help="comma-separated SEO plugins whose postmeta fills `seo`, earliest first "
+        f"(choose from {','.join(SEO_PLUGIN_TABLES)}; default: {','.join(DEFAULT_SEO_PLUGINS)})",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"posts per shard page (default: {DEFAULT_PAGE_SIZE})",
+    )
+    args = parser.parse_args()
+    if args.incremental and args.workers > 1:
+        parser.error("--incremental cannot be combined with --workers")
+    return args
+
+
+def write_posts(
+    posts: Iterable[dict[str, object]],
+    output_path: Path,
+    args: argparse.Namespace,
+    rewriter: UrlRewriter | None = None,
+) -> int:
+    """Write posts.json plus whichever of the SQLite store and shards were requested."""
+    if rewriter:
+        posts = rewriter.rewrite_posts(posts)
+
+    with ExitStack() as stack:
+        artifact = stack.enter_context(open_artifact(output_path)) if args.artifacts else None
+        target = artifact.staging if artifact else output_path
+        writers = [stack.enter_context(open_writer(target, jsonl=args.jsonl))]
+        store = None
+        if args.sqlite:
+            store = stack.enter_context(open_store(args.sqlite, ("posts",)))["posts"]
+            writers.append(store)
+        if args.shards:
+            writers.append(stack.enter_context(open_shards(args.shards, args.page_size)))
+        count = TeeWriter(*writers).write_all(posts)
+
+    if rewriter:
+        print(
+            f"Rewrote {rewriter.replacements} URLs in {rewriter.posts_changed} posts "
+            f"({len(rewriter.targets)} mappings)"
+        )
+    if store is not None:
+        print(f"Indexed {count} posts -> {args.sqlite}")
+        if store.full_text_error:
+            print(f"Skipping full-text index: {store.full_text_error}")
+    if args.shards:
+        print(f"Sharded {count} posts -> {args.shards}")
+    if artifact:
+        state = "updated" if artifact.changed else "unchanged"
+        print(f"Artifacts {state} -> {output_path.parent / MANIFEST_NAME}")
+    return count
+
+
+def regenerate_incremental(
+    input_path: Path, output_path: Path, args: argparse.Namespace, rewriter: UrlRewriter | None
+) -> int:
+    manifest_path = manifest_path_for(output_path)
+    cache_path = cache_path_for(output_path)
+    options = manifest_options(args.seo_plugins, rewriter)
+    manifest = load_manifest(manifest_path, options, cache_path)
+    if not manifest and manifest_path.exists():
+        print(f"{manifest_path.name} does not match this run or its record cache; rebuilding from scratch")
+    updated_manifest: dict[str, dict[str, object]] = {}
+    stats: Counter[str] = Counter()
+
+    with open_record_cache(cache_path) as cache:
+        posts = iter_posts_incremental(input_path, cache, manifest, updated_manifest, stats, args.seo_plugins)
+        count = write_posts(posts, output_path, args, rewriter)
+    save_manifest(manifest_path, updated_manifest, options, cache.generation)
+
+    print(
+        f"Generated {count} posts -> {output_path} "
+        f"({stats['extracted']} extracted, {stats['reused']} unchanged, {stats['removed']} removed)"
+    )
+    return 0
 
 
 def main() -> int:
-    root_dir = Path.cwd()
-    default_input = root_dir / "legacy-wordpress" / "export.xml"
-    default_output = root_dir / "legacy-wordpress" / "content" / "posts.json"
-
-    input_path = Path(sys.argv[1]) if len(sys.argv) > 1 else default_input
-    output_path = Path(sys.argv[2]) if len(sys.argv) > 2 else default_output
+    args = parse_args()
+    input_path: Path = args.input
+    output_path = output_path_for(args.output, args.jsonl)
 
     if not input_path.exists():
         print(f"Input XML not found: {input_path}")
         return 1
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    root = load_xml(input_path)
-    channel = get_channel(root)
-    posts = extract_posts(channel)
-
-    with output_path.open("w", encoding="utf-8") as handle:
-        json.dump(posts, handle, ensure_ascii=False, indent=2)
-
-    print(f"Generated {len(posts)} posts -> {output_path}")
+    if args.shards:
+        # The shards directory is replaced wholesale, taking anything inside it along.
+        shards_dir = args.shards.resolve()
+        inside = [path for path in (output_path, args.sqlite) if path and path.resolve().is_relative_to(shards_dir)]
+        if inside:
+            print(f"--shards {args.shards} must not contain {', '.join(map(str, inside))}")
+            return 1
+        try:
+            check_shards_dir(args.shards)
+        except ValueError as error:
+            print(f"--shards: {error}")
+            return 1
+
+    rewriter = load_rewriter(args.rewrite_urls) if args.rewrite_urls else None
+    if args.incremental:
+        return regenerate_incremental(input_path, output_path, args, rewriter)
+
+    posts: Iterable[dict[str, object]]
+    if args.workers > 1:
+        posts = iter_posts_parallel(input_path, args.workers, seo_mapping=args.seo_plugins)
+    elif args.stream:
+        posts = iter_posts(iter_items(input_path), seo_mapping=args.seo_plugins)
+    else:
+        root = load_xml(input_path)
+        posts = iter_posts(get_channel(root).findall("item"), seo_mapping=args.seo_plugins)
+
+    count = write_posts(posts, output_path, args, rewriter)
+
+    print(f"Generated {count} posts -> {output_path}")
     return 0
 
 
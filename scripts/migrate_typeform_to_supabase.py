@@ -5,6 +5,8 @@ Migrates all Typeform forms and responses to Supabase database
 
 Prerequisites:
 - pip install supabase python-slugify
+- Optional: pip install ijson to stream large JSON response dumps instead of
+  loading each one into memory (JSONL stores are always streamed)
 - Run schema.sql in Supabase first
 - Set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in .env
 """
@@ -12,8 +14,12 @@ Prerequisites:
 import json
 import os
 import re
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import count, islice
 from pathlib import Path
 from slugify import slugify
 
@@ -24,6 +30,12 @@ except ImportError:
     print("Please install supabase: pip install supabase python-slugify")
     exit(1)
 
+# Optional: stream large response dumps instead of loading them whole
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Configuration
 BASE_DIR = Path(__file__).parent.parent
 TYPEFORM_DIR = BASE_DIR / "typeform"
@@ -45,6 +57,18 @@ ENV = load_env()
 SUPABASE_URL = ENV.get('SUPABASE_URL')
 SUPABASE_KEY = ENV.get('SUPABASE_SERVICE_ROLE_KEY')
 
+# Maximum rows sent in a single bulk insert request
+INSERT_BATCH_SIZE = 500
+
+# Attempts upserted per request; all answers of a batch go in one more request
+ATTEMPT_BATCH_SIZE = 200
+
+# Rows per page when reading back existing rows (PostgREST's default max-rows)
+SELECT_PAGE_SIZE = 1000
+
+# Values per `in` filter, keeping the request URL well under server limits
+IN_FILTER_SIZE = 100
+
 # Question type mapping
 TYPEFORM_TO_SUPABASE_TYPE = {
     'multiple_choice': 'multiple_choice',
@@ -77,6 +101,198 @@ def retry_operation(operation, max_retries=3, delay=2):
             time.sleep(wait_time)
 
 
+def chunked(rows: list, size: int):
+    """Yield consecutive slices of at most `size` rows"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def batched(items, size: int):
+    """Yield lists of at most `size` items from any iterable, consuming it lazily"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_rows(supabase, table: str, rows: list, batch_size: int = INSERT_BATCH_SIZE) -> list:
+    """Insert rows with one request per batch, returning the inserted rows"""
+    inserted = []
+    for batch in chunked(rows, batch_size):
+        result = retry_operation(
+            lambda b=batch: supabase.table(table).insert(b).execute()
+        )
+        inserted.extend(result.data)
+    return inserted
+
+
+def insert_form_structure(supabase, assessment_id, parsed: dict) -> dict:
+    """Bulk insert a parsed form's questions, choices and result screens
+
+    Questions go in first; their returned ids are mapped by typeform_ref so
+    every choice can be linked to its question in a single choices insert.
+    Returns the question id map (typeform_ref -> id) and row counts.
+    """
+    questions = [{**question, 'assessment_id': assessment_id} for question in parsed['questions']]
+    inserted_questions = insert_rows(supabase, 'questions', questions)
+    question_id_map = {q['typeform_ref']: q['id'] for q in inserted_questions}
+
+    choices = [
+        {**choice, 'question_id': question_id_map[question_ref]}
+        for question_ref, question_choices in parsed['choices_map'].items()
+        if question_ref in question_id_map
+        for choice in question_choices
+    ]
+    insert_rows(supabase, 'choices', choices)
+
+    screens = [{**screen, 'assessment_id': assessment_id} for screen in parsed['result_screens']]
+    insert_rows(supabase, 'result_screens', screens)
+
+    return {
+        'question_id_map': question_id_map,
+        'questions': len(inserted_questions),
+        'choices': len(choices),
+        'result_screens': len(screens),
+    }
+
+
+def fetch_existing_response_ids(supabase, assessment_id, page_size: int = SELECT_PAGE_SIZE) -> set:
+    """Collect the typeform_response_ids already migrated for an assessment
+
+    Pages through the attempts by id (keyset pagination) so each page is a
+    cheap index range scan however many attempts the assessment has.
+    """
+    response_ids = set()
+    last_id = None
+
+    while True:
+        def fetch_page(after=last_id):
+            query = supabase.table('assessment_attempts').select('id, typeform_response_id').eq('assessment_id', assessment_id)
+            if after is not None:
+                query = query.gt('id', after)
+            return query.order('id').limit(page_size).execute()
+
+        rows = retry_operation(fetch_page).data
+        response_ids.update(row['typeform_response_id'] for row in rows if row.get('typeform_response_id'))
+        if len(rows) < page_size:
+            break
+        last_id = rows[-1]['id']
+
+    return response_ids
+
+
+def fetch_unanswered_attempts(supabase, response_ids: list) -> list:
+    """Return the stored attempts of `response_ids` that have no responses yet
+
+    An upsert that ignores duplicates only returns the rows it inserted, so
+    when it committed but its reply was lost the retry returns nothing for
+    them. Reading them back here keeps their answers from being dropped.
+    """
+    attempts = []
+    for chunk in chunked(response_ids, IN_FILTER_SIZE):
+        rows = retry_operation(
+            lambda c=chunk: supabase.table('assessment_attempts').select('id, typeform_response_id')
+            .in_('typeform_response_id', c).execute()
+        ).data
+        if not rows:
+            continue
+
+        attempt_ids = [row['id'] for row in rows]
+        answered = set()
+        last_id = None
+        while True:
+            def fetch_page(after=last_id):
+                query = supabase.table('responses').select('id, attempt_id').in_('attempt_id', attempt_ids)
+                if after is not None:
+                    query = query.gt('id', after)
+                return query.order('id').limit(SELECT_PAGE_SIZE).execute()
+
+            page = retry_operation(fetch_page).data
+            answered.update(row['attempt_id'] for row in page)
+            if len(page) < SELECT_PAGE_SIZE:
+                break
+            last_id = page[-1]['id']
+
+        attempts.extend(row for row in rows if row['id'] not in answered)
+    return attempts
+
+
+def ingest_attempts(supabase, assessment_id, max_score, attempts, question_id_map: dict,
+                    batch_size: int = ATTEMPT_BATCH_SIZE) -> dict:
+    """Bulk write parsed attempts and their answers
+
+    `attempts` may be any iterable (e.g. the iter_attempts generator); only
+    one batch is held at a time. Each batch is upserted with
+    on_conflict=typeform_response_id, ignoring duplicates, so only newly
+    inserted attempts come back. Attempts of the batch that did not come back
+    but are stored without any responses (e.g. a retried upsert whose first
+    reply was lost) are read back too. Their ids are mapped by
+    typeform_response_id and all of the batch's answers are inserted with a
+    single request. Attempts without a typeform_response_id are skipped.
+    Returns the number of rows written.
+    """
+    written = {'attempts': 0, 'responses': 0}
+
+    for start, batch in zip(count(0, batch_size), batched(attempts, batch_size)):
+        rows = []
+        answers_by_response_id = {}
+        for attempt in batch:
+            if not attempt.get('typeform_response_id'):
+                print(f"    Skipping attempt without a typeform response id (submitted {attempt.get('typeform_submitted_at')})")
+                continue
+            row = {key: value for key, value in attempt.items() if key != 'answers'}
+            row['assessment_id'] = assessment_id
+            row['max_score'] = max_score
+            rows.append(row)
+            answers_by_response_id[row['typeform_response_id']] = attempt['answers']
+        if not rows:
+            continue
+
+        try:
+            result = retry_operation(
+                lambda r=rows: supabase.table('assessment_attempts').upsert(
+                    r, on_conflict='typeform_response_id', ignore_duplicates=True
+                ).execute()
+            )
+        except Exception as e:
+            print(f"    ERROR inserting attempts {start + 1}-{start + len(batch)}: {str(e)[:50]}")
+            continue
+
+        inserted_attempts = list(result.data)
+        returned = {inserted['typeform_response_id'] for inserted in inserted_attempts}
+        missing = [response_id for response_id in answers_by_response_id if response_id not in returned]
+        if missing:
+            try:
+                inserted_attempts.extend(fetch_unanswered_attempts(supabase, missing))
+            except Exception as e:
+                print(f"    ERROR reading back attempts {start + 1}-{start + len(batch)}: {str(e)[:50]}")
+
+        responses = []
+        for inserted in inserted_attempts:
+            for answer in answers_by_response_id.get(inserted['typeform_response_id'], []):
+                question_id = question_id_map.get(answer['question_ref'])
+                if question_id is None:
+                    continue
+                response = {key: value for key, value in answer.items() if key != 'question_ref'}
+                response['attempt_id'] = inserted['id']
+                response['question_id'] = question_id
+                responses.append(response)
+
+        written['attempts'] += len(inserted_attempts)
+        if responses:
+            try:
+                insert_rows(supabase, 'responses', responses, batch_size=len(responses))
+                written['responses'] += len(responses)
+            except Exception as e:
+                print(f"    ERROR inserting responses for attempts {start + 1}-{start + len(batch)}: {str(e)[:50]}")
+
+        print(f"    Progress: {start + len(batch)} attempts")
+
+    return written
+
+
 def create_slug(title: str, existing_slugs: set) -> str:
     """Create a unique slug from title"""
     base_slug = slugify(title, max_length=50)
@@ -225,81 +441,248 @@ def parse_typeform_form(form_data: dict) -> dict:
     }
 
 
+def parse_typeform_response(response: dict) -> dict:
+    """Parse one Typeform response into a Supabase attempt with its answers"""
+    # Extract user info from answers
+    user_email = None
+    user_name = None
+    user_country = None
+
+    answers = response.get('answers') or []
+    for answer in answers:
+        field_type = answer.get('type')
+        if field_type == 'email':
+            user_email = answer.get('email')
+        elif field_type == 'text' and 'name' in answer.get('field', {}).get('ref', '').lower():
+            user_name = answer.get('text')
+
+    # Calculate score from variables
+    variables = response.get('variables') or []
+    score = 0
+    for var in variables:
+        if var.get('key') == 'score':
+            score = var.get('number', 0)
+
+    attempt = {
+        'typeform_response_id': response.get('response_id') or response.get('token'),
+        'user_email': user_email,
+        'user_name': user_name,
+        'user_country': user_country,
+        'score': score,
+        'typeform_submitted_at': response.get('submitted_at'),
+        'typeform_landed_at': response.get('landed_at'),
+        'answers': [],  # Will be transformed to responses
+    }
+
+    # Parse answers
+    for answer in answers:
+        field_ref = answer.get('field', {}).get('ref')
+        field_type = answer.get('type')
+
+        response_data = {
+            'question_ref': field_ref,
+            'text_value': None,
+            'number_value': None,
+            'boolean_value': None,
+        }
+
+        if field_type == 'text':
+            response_data['text_value'] = answer.get('text')
+        elif field_type == 'email':
+            response_data['text_value'] = answer.get('email')
+        elif field_type == 'number':
+            response_data['number_value'] = answer.get('number')
+        elif field_type == 'boolean':
+            response_data['boolean_value'] = answer.get('boolean')
+        elif field_type == 'choice':
+            choice = answer.get('choice', {})
+            # Store choice label as text
+            response_data['text_value'] = choice.get('label', choice.get('ref', ''))
+        elif field_type == 'choices':
+            choices = answer.get('choices', {})
+            labels = choices.get('labels', [])
+            # Store multiple choices as comma-separated text
+            response_data['text_value'] = ', '.join(labels) if labels else None
+
+        attempt['answers'].append(response_data)
+
+    return attempt
+
+
+def iter_attempts(responses):
+    """Lazily parse an iterable of Typeform responses into attempts"""
+    for response in responses:
+        yield parse_typeform_response(response)
+
+
 def parse_typeform_responses(responses_data: dict, question_map: dict) -> list:
     """Parse Typeform responses into Supabase format"""
-    attempts = []
+    return list(iter_attempts(responses_data.get('items', responses_data.get('responses', []))))
 
-    for response in responses_data.get('items', responses_data.get('responses', [])):
-        # Extract user info from answers
-        user_email = None
-        user_name = None
-        user_country = None
-
-        answers = response.get('answers') or []
-        for answer in answers:
-            field_type = answer.get('type')
-            if field_type == 'email':
-                user_email = answer.get('email')
-            elif field_type == 'text' and 'name' in answer.get('field', {}).get('ref', '').lower():
-                user_name = answer.get('text')
-
-        # Calculate score from variables
-        variables = response.get('variables') or []
-        score = 0
-        for var in variables:
-            if var.get('key') == 'score':
-                score = var.get('number', 0)
-
-        attempt = {
-            'typeform_response_id': response.get('response_id') or response.get('token'),
-            'user_email': user_email,
-            'user_name': user_name,
-            'user_country': user_country,
-            'score': score,
-            'typeform_submitted_at': response.get('submitted_at'),
-            'typeform_landed_at': response.get('landed_at'),
-            'answers': [],  # Will be transformed to responses
-        }
 
-        # Parse answers
-        for answer in answers:
-            field_ref = answer.get('field', {}).get('ref')
-            field_type = answer.get('type')
+def find_responses_file(form_id: str):
+    """Locate a form's responses: a JSONL store from the exporter or a JSON dump
 
-            response_data = {
-                'question_ref': field_ref,
-                'text_value': None,
-                'number_value': None,
-                'boolean_value': None,
-            }
+    When several exist (say a JSONL store left behind by an older streamed
+    export next to a fresh JSON dump), the most recently written one is used;
+    on equal timestamps JSONL is preferred.
+    """
+    responses_dir = TYPEFORM_DIR / "responses"
+    names = (f"{form_id}.jsonl", f"{form_id}_responses.jsonl", f"{form_id}.json", f"{form_id}_responses.json")
+    candidates = [responses_dir / name for name in names if (responses_dir / name).exists()]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda path: path.stat().st_mtime)
 
-            if field_type == 'text':
-                response_data['text_value'] = answer.get('text')
-            elif field_type == 'email':
-                response_data['text_value'] = answer.get('email')
-            elif field_type == 'number':
-                response_data['number_value'] = answer.get('number')
-            elif field_type == 'boolean':
-                response_data['boolean_value'] = answer.get('boolean')
-            elif field_type == 'choice':
-                choice = answer.get('choice', {})
-                # Store choice label as text
-                response_data['text_value'] = choice.get('label', choice.get('ref', ''))
-            elif field_type == 'choices':
-                choices = answer.get('choices', {})
-                labels = choices.get('labels', [])
-                # Store multiple choices as comma-separated text
-                response_data['text_value'] = ', '.join(labels) if labels else None
-
-            attempt['answers'].append(response_data)
-
-        attempts.append(attempt)
 
-    return attempts
+def iter_response_items(path: Path):
+    """Yield the responses stored in `path` one at a time
+
+    JSONL stores are read line by line. JSON dumps ({"items": [...]} from
+    the API or {"responses": [...]} from the exporter) are streamed with
+    ijson when it is installed, and loaded whole otherwise.
+    """
+    if path.suffix == '.jsonl':
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    if ijson is None:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        yield from data.get('items', data.get('responses', []))
+        return
+
+    for prefix in ('items.item', 'responses.item'):
+        found = False
+        with open(path, 'rb') as f:
+            for item in ijson.items(f, prefix, use_float=True):
+                found = True
+                yield item
+        if found:
+            return
+
+
+_thread_local = threading.local()
+
+
+def get_thread_client() -> 'Client':
+    """Supabase client for the current worker thread, created on first use
+
+    Clients are not shared between threads, so there are at most as many
+    clients (and connection pools) as migration workers.
+    """
+    client = getattr(_thread_local, 'client', None)
+    if client is None:
+        client = _thread_local.client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return client
+
+
+def prepare_forms(inventory: dict) -> list:
+    """Load and parse every form, allocating slugs in inventory order
+
+    Slugs depend on the titles seen before them, so they are assigned here,
+    serially, before any worker starts. Returns (form_info, parsed) pairs;
+    parsed is None when the form file is missing.
+    """
+    existing_slugs = set()
+    jobs = []
+    for form_info in inventory['forms']:
+        form_path = TYPEFORM_DIR / "forms" / f"{form_info['id']}.json"
+        parsed = None
+        if form_path.exists():
+            with open(form_path) as f:
+                parsed = parse_typeform_form(json.load(f))
+            parsed['assessment']['slug'] = create_slug(parsed['assessment']['title'], existing_slugs)
+        jobs.append((form_info, parsed))
+    return jobs
+
+
+def migrate_form(form_info: dict, parsed, dry_run: bool, batch_size: int) -> Counter:
+    """Migrate one form's assessment, structure and responses; returns row counts"""
+    stats = Counter()
+    form_id = form_info['id']
+    form_title = form_info['title']
+    response_count = form_info.get('response_count', 0)
+
+    print(f"\n[Processing] {form_title} ({form_id})")
+    print(f"  Responses: {response_count}")
+
+    if parsed is None:
+        print(f"  SKIP: Form file not found")
+        return stats
+
+    assessment = parsed['assessment']
+
+    print(f"  Questions: {len(parsed['questions'])}")
+    print(f"  Result screens: {len(parsed['result_screens'])}")
+
+    if not dry_run:
+        supabase = get_thread_client()
+        # Check if assessment already exists
+        existing = supabase.table('assessments').select('id').eq('typeform_id', form_id).execute()
+        if existing.data:
+            print(f"  SKIP: Already exists in database")
+            assessment_id = existing.data[0]['id']
+            # Load question mapping for responses
+            existing_questions = supabase.table('questions').select('id, typeform_ref').eq('assessment_id', assessment_id).execute()
+            question_id_map = {q['typeform_ref']: q['id'] for q in existing_questions.data}
+            # Responses migrated by an earlier run, fetched once instead of per attempt
+            existing_response_ids = fetch_existing_response_ids(supabase, assessment_id) if response_count > 0 else set()
+        else:
+            # Insert new assessment
+            result = supabase.table('assessments').insert(assessment).execute()
+            assessment_id = result.data[0]['id']
+            existing_response_ids = set()
+
+            # Insert questions, choices and result screens (only for new assessments)
+            inserted = insert_form_structure(supabase, assessment_id, parsed)
+            question_id_map = inserted['question_id_map']
+            for key in ('questions', 'choices', 'result_screens'):
+                stats[key] += inserted[key]
+
+            stats['assessments'] += 1
+    else:
+        stats['assessments'] += 1
+        stats['questions'] += len(parsed['questions'])
+        for choices in parsed['choices_map'].values():
+            stats['choices'] += len(choices)
+        stats['result_screens'] += len(parsed['result_screens'])
+
+    # Stream responses through parsing and batched writes
+    if response_count > 0:
+        responses_path = find_responses_file(form_id)
+        if responses_path:
+            attempts = iter_attempts(iter_response_items(responses_path))
+
+            if not dry_run:
+                if existing_response_ids:
+                    print(f"  Already migrated: {len(existing_response_ids)}")
+                    attempts = (a for a in attempts if a['typeform_response_id'] not in existing_response_ids)
+                written = ingest_attempts(
+                    supabase, assessment_id, assessment['total_points'], attempts,
+                    question_id_map, batch_size=batch_size,
+                )
+                stats['attempts'] += written['attempts']
+                stats['responses'] += written['responses']
+            else:
+                for attempt in attempts:
+                    stats['attempts'] += 1
+                    stats['responses'] += len(attempt.get('answers', []))
+                print(f"  Parsed attempts: {stats['attempts']}")
+
+    return stats
 
 
-def migrate_to_supabase(dry_run: bool = True):
-    """Main migration function"""
+def migrate_to_supabase(dry_run: bool = True, batch_size: int = ATTEMPT_BATCH_SIZE, workers: int = 1):
+    """Main migration function
+
+    Attempts are written batch_size at a time (see ingest_attempts). With
+    workers > 1 forms are migrated concurrently, each worker thread using
+    its own Supabase client.
+    """
 
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("ERROR: Missing Supabase credentials!")
@@ -315,9 +698,7 @@ def migrate_to_supabase(dry_run: bool = True):
     print("=" * 60)
     print(f"\nDry run: {dry_run}")
     print(f"Supabase URL: {SUPABASE_URL}")
-
-    if not dry_run:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    print(f"Workers: {workers}")
 
     # Load inventory
     inventory_path = TYPEFORM_DIR / "inventory" / "complete_inventory.json"
@@ -327,156 +708,24 @@ def migrate_to_supabase(dry_run: bool = True):
     print(f"\nForms to migrate: {inventory['total_forms']}")
     print(f"Total responses: {inventory['total_responses']}")
 
-    existing_slugs = set()
-    migration_stats = {
+    migration_stats = Counter({
         'assessments': 0,
         'questions': 0,
         'choices': 0,
         'result_screens': 0,
         'attempts': 0,
         'responses': 0,
-    }
+    })
 
     # Process each form
-    for form_info in inventory['forms']:
-        form_id = form_info['id']
-        form_title = form_info['title']
-        response_count = form_info.get('response_count', 0)
-
-        print(f"\n[Processing] {form_title} ({form_id})")
-        print(f"  Responses: {response_count}")
-
-        # Load form structure
-        form_path = TYPEFORM_DIR / "forms" / f"{form_id}.json"
-        if not form_path.exists():
-            print(f"  SKIP: Form file not found")
-            continue
-
-        with open(form_path) as f:
-            form_data = json.load(f)
-
-        # Parse form
-        parsed = parse_typeform_form(form_data)
-        assessment = parsed['assessment']
-        assessment['slug'] = create_slug(assessment['title'], existing_slugs)
-
-        print(f"  Questions: {len(parsed['questions'])}")
-        print(f"  Result screens: {len(parsed['result_screens'])}")
-
-        if not dry_run:
-            # Check if assessment already exists
-            existing = supabase.table('assessments').select('id').eq('typeform_id', form_id).execute()
-            if existing.data:
-                print(f"  SKIP: Already exists in database")
-                assessment_id = existing.data[0]['id']
-                # Load question mapping for responses
-                existing_questions = supabase.table('questions').select('id, typeform_ref').eq('assessment_id', assessment_id).execute()
-                question_id_map = {q['typeform_ref']: q['id'] for q in existing_questions.data}
-            else:
-                # Insert new assessment
-                result = supabase.table('assessments').insert(assessment).execute()
-                assessment_id = result.data[0]['id']
-
-                # Insert questions and choices (only for new assessments)
-                question_id_map = {}  # typeform_ref -> supabase_id
-                for question in parsed['questions']:
-                    question['assessment_id'] = assessment_id
-                    q_result = retry_operation(
-                        lambda q=question: supabase.table('questions').insert(q).execute()
-                    )
-                    question_id = q_result.data[0]['id']
-                    question_id_map[question['typeform_ref']] = question_id
-
-                    # Insert choices
-                    if question['typeform_ref'] in parsed['choices_map']:
-                        for choice in parsed['choices_map'][question['typeform_ref']]:
-                            choice['question_id'] = question_id
-                            retry_operation(
-                                lambda c=choice: supabase.table('choices').insert(c).execute()
-                            )
-                            migration_stats['choices'] += 1
-
-                    migration_stats['questions'] += 1
-
-                # Insert result screens
-                for screen in parsed['result_screens']:
-                    screen['assessment_id'] = assessment_id
-                    retry_operation(
-                        lambda s=screen: supabase.table('result_screens').insert(s).execute()
-                    )
-                    migration_stats['result_screens'] += 1
-
-                migration_stats['assessments'] += 1
-        else:
-            migration_stats['assessments'] += 1
-            migration_stats['questions'] += len(parsed['questions'])
-            for choices in parsed['choices_map'].values():
-                migration_stats['choices'] += len(choices)
-            migration_stats['result_screens'] += len(parsed['result_screens'])
-
-        # Load and process responses
-        if response_count > 0:
-            responses_path = TYPEFORM_DIR / "responses" / f"{form_id}.json"
-            if responses_path.exists():
-                with open(responses_path) as f:
-                    responses_data = json.load(f)
-
-                attempts = parse_typeform_responses(responses_data, {})
-                print(f"  Parsed attempts: {len(attempts)}")
-
-                if not dry_run:
-                    for idx, attempt in enumerate(attempts):
-                        # Check if attempt already exists
-                        try:
-                            existing_attempt = retry_operation(
-                                lambda a=attempt: supabase.table('assessment_attempts').select('id').eq('typeform_response_id', a['typeform_response_id']).execute()
-                            )
-                            if existing_attempt.data:
-                                continue  # Skip silently
-                        except Exception as e:
-                            print(f"    ERROR checking attempt: {str(e)[:50]}")
-                            continue
-
-                        attempt_answers = attempt.pop('answers')
-                        attempt['assessment_id'] = assessment_id
-                        attempt['max_score'] = assessment['total_points']
-
-                        try:
-                            a_result = retry_operation(
-                                lambda a=attempt: supabase.table('assessment_attempts').insert(a).execute()
-                            )
-                            attempt_id = a_result.data[0]['id']
-
-                            for answer in attempt_answers:
-                                question_ref = answer.pop('question_ref')
-                                if question_ref in question_id_map:
-                                    answer['attempt_id'] = attempt_id
-                                    answer['question_id'] = question_id_map[question_ref]
-                                    try:
-                                        retry_operation(
-                                            lambda ans=answer: supabase.table('responses').insert(ans).execute()
-                                        )
-                                        migration_stats['responses'] += 1
-                                    except Exception as e:
-                                        print(f"    ERROR inserting response: {str(e)[:50]}")
-
-                            migration_stats['attempts'] += 1
-
-                            # Progress update every 100 attempts
-                            if (idx + 1) % 100 == 0:
-                                print(f"    Progress: {idx + 1}/{len(attempts)} attempts")
-
-                        except Exception as e:
-                            print(f"    ERROR inserting attempt: {str(e)[:50]}")
-                            continue
-
-                        # Small delay to avoid rate limits
-                        if idx % 50 == 0:
-                            time.sleep(0.5)
-                else:
-                    migration_stats['attempts'] += len(attempts)
-                    for attempt in attempts:
-                        migration_stats['responses'] += len(attempt.get('answers', []))
+    jobs = prepare_forms(inventory)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(migrate_form, form_info, parsed, dry_run, batch_size)
+            for form_info, parsed in jobs
+        ]
+        for future in futures:
+            migration_stats.update(future.result())
 
     print("\n" + "=" * 60)
     print("MIGRATION SUMMARY")
@@ -493,9 +742,17 @@ def migrate_to_supabase(dry_run: bool = True):
     if dry_run:
         print("\nTo run the actual migration, call:")
         print("  migrate_to_supabase(dry_run=False)")
+        print("or run this script with --execute")
 
 
 if __name__ == '__main__':
-    import sys
-    dry_run = '--execute' not in sys.argv
-    migrate_to_supabase(dry_run=dry_run)
+    import argparse
+    parser = argparse.ArgumentParser(description='Migrate Typeform forms and responses to Supabase')
+    parser.add_argument('--execute', action='store_true', help='write to Supabase (default is a dry run)')
+    parser.add_argument('--batch-size', type=int, default=ATTEMPT_BATCH_SIZE,
+                        help=f'attempts upserted per request (default: {ATTEMPT_BATCH_SIZE})')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='forms migrated concurrently (default: 1)')
+    args = parser.parse_args()
+    migrate_to_supabase(dry_run=not args.execute, batch_size=max(1, args.batch_size),
+                        workers=max(1, args.workers))
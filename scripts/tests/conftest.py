@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The scripts import wxr and each other as top-level modules, as they do when run from scripts/.
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS_DIR))
@@ -0,0 +1,52 @@
+import pytest
+
+from wxr.posts import FeaturedImageResolver
+
+
+def resolve(events, max_held=1000):
+    """Feed ("attachment", id, url) and ("post", slug, thumbnail_id) events; return slug -> image."""
+    resolver = FeaturedImageResolver(max_held=max_held)
+    released = []
+    for kind, key, value in events:
+        if kind == "attachment":
+            released.extend(resolver.add_attachment(key, value))
+        else:
+            released.extend(resolver.add_record({"slug": key, "featured_image": ""}, value))
+    released.extend(resolver.finish())
+    return {record["slug"]: record["featured_image"] for record in released}
+
+
+@pytest.mark.parametrize("max_held", [1000, 1])
+def test_duplicate_attachment_id_keeps_first_url(max_held):
+    events = [
+        ("post", "before", "7"),
+        ("attachment", "7", "https://example.com/first.jpg"),
+        ("post", "between", "7"),
+        ("attachment", "7", "https://example.com/second.jpg"),
+        ("post", "after", "7"),
+    ]
+    assert resolve(events, max_held) == {
+        "before": "https://example.com/first.jpg",
+        "between": "https://example.com/first.jpg",
+        "after": "https://example.com/first.jpg",
+    }
+
+
+@pytest.mark.parametrize("max_held", [1000, 1])
+def test_records_keep_export_order(max_held):
+    resolver = FeaturedImageResolver(max_held=max_held)
+    released = []
+    released += resolver.add_record({"slug": "a"}, "5")
+    released += resolver.add_record({"slug": "b"}, "")
+    released += resolver.add_attachment("5", "https://example.com/a.jpg")
+    released += resolver.add_record({"slug": "c"}, "404")
+    released += resolver.finish()
+    assert [record["slug"] for record in released] == ["a", "b", "c"]
+    assert released[0]["featured_image"] == "https://example.com/a.jpg"
+    assert "featured_image" not in released[2]
+
+
+def test_blank_and_zero_thumbnails_are_not_waited_for():
+    resolver = FeaturedImageResolver()
+    assert resolver.add_record({"slug": "zero"}, "0") == [{"slug": "zero"}]
+    assert resolver.add_record({"slug": "blank"}, "") == [{"slug": "blank"}]
@@ -0,0 +1,106 @@
+"""Run typeform_full_export.py end to end against typeform_stub_server.py."""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from typeform_stub_server import StubHandler, build_forms
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+FORM_COUNT = 4
+RESPONSES_PER_FORM = 30
+
+
+@pytest.fixture
+def stub():
+    """Serve a fresh stub account from a thread; yields the handler class, which records every status sent"""
+    forms, responses = build_forms(FORM_COUNT, RESPONSES_PER_FORM)
+
+    class RecordingHandler(StubHandler):
+        statuses = []
+
+        def send_response(self, code, message=None):
+            self.statuses.append((self.path.split('?')[0], code))
+            super().send_response(code, message)
+
+    RecordingHandler.forms, RecordingHandler.responses = forms, responses
+    RecordingHandler.latency = 0.0
+    StubHandler.request_times = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RecordingHandler)
+    RecordingHandler.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield RecordingHandler
+    server.shutdown()
+    server.server_close()
+
+
+def run_export(base_url, export_dir, *args):
+    env = {
+        **os.environ,
+        'TYPEFORM_API_KEY': 'stub',
+        'TYPEFORM_BASE_URL': base_url,
+        'TYPEFORM_EXPORT_DIR': str(export_dir),
+        # Leave throttling to the stub so its 429s are what slows the export down
+        'TYPEFORM_REQUESTS_PER_SECOND': '0',
+    }
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / 'typeform_full_export.py'), *args],
+        env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout
+
+
+def expected_counts(handler):
+    return {form_id: len(items) for form_id, items in handler.responses.items()}
+
+
+def test_export_retries_rate_limited_requests(stub, tmp_path):
+    stub.rate_limit = 3
+    output = run_export(stub.base_url, tmp_path, '--concurrency', '4')
+
+    assert 'Rate limited, waiting' in output
+    assert any(code == 429 for _, code in stub.statuses)
+    inventory = json.loads((tmp_path / 'inventory' / 'complete_inventory.json').read_text())
+    assert {form['id']: form['response_count'] for form in inventory['forms']} == expected_counts(stub)
+    for form_id, count in expected_counts(stub).items():
+        assert (tmp_path / 'forms' / f'{form_id}_structure.json').exists()
+        dump = json.loads((tmp_path / 'responses' / f'{form_id}_responses.json').read_text())
+        assert len(dump['responses']) == count
+
+
+def test_forms_list_is_revalidated_with_etag(stub, tmp_path):
+    stub.rate_limit = 0
+    run_export(stub.base_url, tmp_path)
+    first_list = (tmp_path / 'inventory' / 'all_forms_list.json').read_text()
+    cache = json.loads((tmp_path / 'inventory' / 'forms_cache.json').read_text())
+    assert cache['pages']['1']['etag']
+    assert ('/forms', 304) not in stub.statuses
+
+    stub.statuses.clear()
+    run_export(stub.base_url, tmp_path)
+    assert ('/forms', 304) in stub.statuses
+    assert (tmp_path / 'inventory' / 'all_forms_list.json').read_text() == first_list
+
+
+def test_incremental_export_only_appends_new_responses(stub, tmp_path):
+    stub.rate_limit = 0
+    run_export(stub.base_url, tmp_path, '--incremental')
+    form_id = next(iter(stub.responses))
+    newest = dict(stub.responses[form_id][0], token=f'{form_id}-late', submitted_at='2030-01-01T00:00:00Z')
+    stub.responses[form_id].insert(0, newest)
+
+    output = run_export(stub.base_url, tmp_path, '--incremental')
+
+    assert f'({form_id}) - 1 new' in output
+    lines = (tmp_path / 'responses' / f'{form_id}_responses.jsonl').read_text().splitlines()
+    tokens = [json.loads(line)['token'] for line in lines]
+    assert len(tokens) == len(set(tokens)) == expected_counts(stub)[form_id]
+    assert tokens[-1] == f'{form_id}-late'
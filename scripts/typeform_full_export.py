@@ -4,93 +4,488 @@ Typeform Complete Data Export Script for Periospot Migration
 Downloads all forms, responses, and metadata from Typeform API
 """
 
+import argparse
+import hashlib
 import os
 import json
+import random
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from itertools import repeat
 from pathlib import Path
 
 # Configuration
 API_KEY = os.environ.get('TYPEFORM_API_KEY')
 if not API_KEY:
     raise RuntimeError('TYPEFORM_API_KEY is required')
-BASE_URL = 'https://api.typeform.com'
-HEADERS = {'Authorization': f'Bearer {API_KEY}'}
+BASE_URL = os.environ.get('TYPEFORM_BASE_URL', 'https://api.typeform.com')
+
+# Typeform allows 2 requests per second per account; set to 0 to disable
+REQUESTS_PER_SECOND = float(os.environ.get('TYPEFORM_REQUESTS_PER_SECOND', '2'))
 
 # Output directories
-BASE_DIR = Path(__file__).parent.parent / 'typeform'
+BASE_DIR = Path(os.environ.get('TYPEFORM_EXPORT_DIR', Path(__file__).parent.parent / 'typeform'))
 FORMS_DIR = BASE_DIR / 'forms'
 RESPONSES_DIR = BASE_DIR / 'responses'
 EXPORTS_DIR = BASE_DIR / 'exports'
 INVENTORY_DIR = BASE_DIR / 'inventory'
+CHECKPOINT_PATH = INVENTORY_DIR / 'sync_checkpoint.json'
+FORMS_CACHE_PATH = INVENTORY_DIR / 'forms_cache.json'
+
+# Bytes hashed at each end of a JSONL store to check it against the checkpoint
+STORE_FINGERPRINT_BYTES = 64 * 1024
+
+# The /forms endpoint accepts up to 200 forms per page
+FORMS_PAGE_SIZE = 200
 
 def ensure_dirs():
     """Create output directories if they don't exist"""
     for dir_path in [FORMS_DIR, RESPONSES_DIR, EXPORTS_DIR, INVENTORY_DIR]:
         dir_path.mkdir(parents=True, exist_ok=True)
 
-def get_all_forms():
-    """Fetch all forms from Typeform API (paginated)"""
-    all_forms = []
-    page = 1
-    page_size = 10
+# Retry policy for rate limits (429), server errors and dropped connections
+MAX_RETRIES = int(os.environ.get('TYPEFORM_MAX_RETRIES', '5'))
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.paused_until and self.rate <= 0:
+                    return
+                if now >= self.paused_until:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                    self.updated_at = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.paused_until - now
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Stop handing out tokens for `seconds`, e.g. after the server sent Retry-After"""
+        with self.lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0.0
+            self.updated_at = self.paused_until
+
+def retry_after_seconds(response):
+    """Parse a Retry-After header (delta seconds or HTTP date), or None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+
+class TypeformClient:
+    """Typeform API client sharing one pooled keep-alive session across threads
+
+    Requests are throttled with a token bucket; 429s and transient failures
+    are retried, honouring Retry-After and otherwise backing off exponentially.
+    """
+
+    def __init__(self, api_key, base_url=BASE_URL, requests_per_second=REQUESTS_PER_SECOND,
+                 burst=1, max_retries=MAX_RETRIES, pool_size=16, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.session = requests.Session()
+        self.session.headers.update({'Authorization': f'Bearer {api_key}'})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def backoff(self, attempt):
+        delay = min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def request(self, path, params=None, headers=None):
+        """GET `path` (relative to the base URL, or absolute) with retries, returning the response
+
+        A 304 Not Modified is returned as is so callers can use their cached copy.
+        """
+        url = path if path.startswith('http') else f'{self.base_url}{path}'
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                print(f"  Request failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = self.backoff(attempt)
+                if response.status_code == 429:
+                    # Rate limits are per account, so every worker has to wait
+                    self.bucket.pause(delay)
+                    print(f"  Rate limited, waiting {delay:.1f}s")
+                else:
+                    print(f"  HTTP {response.status_code}, retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                continue
+
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+
+    def get(self, path, params=None):
+        """GET `path` and return the decoded JSON"""
+        return self.request(path, params=params).json()
+
+    def get_cached(self, path, params, cached):
+        """GET with If-None-Match/If-Modified-Since from a cached entry
+
+        `cached` is a previous return value of this method (or None). Returns
+        a cache entry: {'etag', 'last_modified', 'data'}.
+        """
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.request(path, params=params, headers=headers)
+        if response.status_code == 304:
+            return cached
+        return {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'data': response.json(),
+        }
+
+    def get_account_info(self):
+        """Get Typeform account information"""
+        return self.get('/me')
+
+    def get_all_forms(self, page_size=FORMS_PAGE_SIZE, cache_path=None, workers=1):
+        """Fetch all forms (paginated)
+
+        The first page reports the page count; the remaining pages are then
+        fetched by up to `workers` threads. With a cache_path, pages are revalidated with
+        ETag/Last-Modified and unchanged pages are served from the cache.
+        """
+        cache = {}
+        if cache_path:
+            try:
+                with open(cache_path, encoding='utf-8') as f:
+                    cache = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                cache = {}
+            if cache.get('page_size') != page_size:
+                cache = {}
+        cached_pages = cache.get('pages', {})
+
+        def fetch_page(page):
+            entry = self.get_cached('/forms', {'page': page, 'page_size': page_size}, cached_pages.get(str(page)))
+            print(f"  Fetched page {page}: {len(entry['data'].get('items', []))} forms")
+            return entry
+
+        first = fetch_page(1)
+        page_count = max(1, first['data'].get('page_count') or 1)
+        pages = [first]
+        if page_count > 1:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, page_count - 1))) as pool:
+                pages.extend(pool.map(fetch_page, range(2, page_count + 1)))
+
+        if cache_path:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            save_json({
+                'page_size': page_size,
+                'pages': {str(number): entry for number, entry in enumerate(pages, 1)},
+            }, cache_path)
 
-    while True:
-        url = f'{BASE_URL}/forms?page={page}&page_size={page_size}'
-        response = requests.get(url, headers=HEADERS)
-        data = response.json()
+        return [form for entry in pages for form in entry['data'].get('items', [])]
 
-        forms = data.get('items', [])
-        all_forms.extend(forms)
+    def get_form_details(self, form_id):
+        """Fetch complete form structure and configuration"""
+        return self.get(f'/forms/{form_id}')
 
-        print(f"  Fetched page {page}: {len(forms)} forms")
+    def iter_response_pages(self, form_id, page_size=1000):
+        """Yield the responses of a form one page at a time, newest first"""
+        params = {'page_size': page_size}
 
-        if len(forms) < page_size:
-            break
-        page += 1
+        while params:
+            data = self.get(f'/forms/{form_id}/responses', params=params)
 
-    return all_forms
+            items = data.get('items', [])
+            if items:
+                yield items
 
-def get_form_details(form_id):
-    """Fetch complete form structure and configuration"""
-    url = f'{BASE_URL}/forms/{form_id}'
-    response = requests.get(url, headers=HEADERS)
-    return response.json()
+            # Older pages are requested with the token of the last response seen
+            next_token = data.get('page_token') or (items[-1].get('token') if items else None)
+            if next_token and len(items) == page_size:
+                params = {'page_size': page_size, 'before': next_token}
+            else:
+                params = None
 
-def get_form_responses(form_id, page_size=1000):
-    """Fetch all responses for a form (paginated)"""
-    all_responses = []
-    url = f'{BASE_URL}/forms/{form_id}/responses?page_size={page_size}'
+    def get_form_responses(self, form_id, page_size=1000):
+        """Fetch all responses for a form (paginated)"""
+        all_responses = []
+        for items in self.iter_response_pages(form_id, page_size=page_size):
+            all_responses.extend(items)
+        return all_responses
 
-    while url:
-        response = requests.get(url, headers=HEADERS)
-        data = response.json()
+client = TypeformClient(API_KEY)
 
-        items = data.get('items', [])
-        all_responses.extend(items)
+def get_all_forms(workers=1):
+    """Fetch all forms from Typeform API (paginated, cached in FORMS_CACHE_PATH)"""
+    return client.get_all_forms(cache_path=FORMS_CACHE_PATH, workers=workers)
 
-        # Get next page token if exists
-        next_token = data.get('page_token')
-        if next_token and len(items) == page_size:
-            url = f'{BASE_URL}/forms/{form_id}/responses?page_size={page_size}&before={next_token}'
-        else:
-            url = None
+def get_form_details(form_id):
+    """Fetch complete form structure and configuration"""
+    return client.get_form_details(form_id)
 
-    return all_responses
+def get_form_responses(form_id, page_size=1000):
+    """Fetch all responses for a form (paginated)"""
+    return client.get_form_responses(form_id, page_size=page_size)
 
 def get_account_info():
     """Get Typeform account information"""
-    url = f'{BASE_URL}/me'
-    response = requests.get(url, headers=HEADERS)
-    return response.json()
+    return client.get_account_info()
+
+def stream_form_responses(form_id, filepath, page_size=1000):
+    """Write a form's responses to `filepath` as JSONL, one page at a time
+
+    Only a single page is held in memory. The file is written under a
+    temporary name and moved into place once the last page has arrived.
+    Returns the number of responses written.
+    """
+    partial_path = filepath.with_name(filepath.name + '.part')
+    count = 0
+    with open(partial_path, 'w', encoding='utf-8') as f:
+        for items in client.iter_response_pages(form_id, page_size=page_size):
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False, default=str))
+                f.write('\n')
+            count += len(items)
+    partial_path.replace(filepath)
+    return count
+
+class SyncCheckpoint:
+    """Per-form sync state persisted in CHECKPOINT_PATH
+
+    For every form it records the submitted_at of the newest stored response,
+    the tokens stored at exactly that time (the `since` filter is inclusive),
+    the response count and the byte size of the JSONL store when the state
+    was saved, so a half-written page can be cut off on resume. A fingerprint
+    of the stored bytes tells whether the file is still the one described,
+    e.g. not rewritten since by a --stream export.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.forms = json.load(f)
+        except FileNotFoundError:
+            self.forms = {}
+
+    def get(self, form_id):
+        with self.lock:
+            return dict(self.forms.get(form_id) or {})
+
+    def update(self, form_id, state):
+        """Record a form's state and rewrite the checkpoint file atomically"""
+        with self.lock:
+            self.forms[form_id] = state
+            partial_path = self.path.with_name(self.path.name + '.part')
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                json.dump(self.forms, f, indent=2, ensure_ascii=False)
+            partial_path.replace(self.path)
+
+def store_fingerprint(f, offset):
+    """Hash the head and tail of the first `offset` bytes of an open JSONL store"""
+    digest = hashlib.sha256()
+    f.seek(0)
+    digest.update(f.read(min(offset, STORE_FINGERPRINT_BYTES)))
+    if offset > STORE_FINGERPRINT_BYTES:
+        f.seek(max(offset - STORE_FINGERPRINT_BYTES, STORE_FINGERPRINT_BYTES))
+        digest.update(f.read(offset - f.tell()))
+    return digest.hexdigest()
+
+def sync_form_responses(form_id, filepath, checkpoint, page_size=1000):
+    """Append responses newer than the checkpoint to the form's JSONL store
+
+    Pages are requested oldest first with `since` set to the last stored
+    submitted_at, and the checkpoint is saved after every page so an
+    interrupted sync resumes from the last complete page. A store that no
+    longer matches the checkpoint is rebuilt from scratch.
+    Returns (new responses, total responses in the store).
+    """
+    state = checkpoint.get(form_id)
+    if not filepath.exists():
+        state = {}
+
+    with open(filepath, 'a+b') as f:
+        offset = state.get('offset', 0)
+        size = f.seek(0, os.SEEK_END)
+        if offset and (size < offset or state.get('fingerprint') != store_fingerprint(f, offset)):
+            print(f"    {form_id}: {filepath.name} does not match the sync checkpoint, resyncing from scratch")
+            state = {}
+        # Drop anything written after the last checkpointed page
+        f.truncate(state.get('offset', 0))
+        total = state.get('response_count', 0)
+        new = 0
+
+        while True:
+            params = {'page_size': page_size, 'sort': 'submitted_at,asc'}
+            if state.get('submitted_at'):
+                params['since'] = state['submitted_at']
+            items = client.get(f'/forms/{form_id}/responses', params=params).get('items', [])
+
+            seen = set(state.get('boundary_tokens', []))
+            fresh = [item for item in items if item.get('token') not in seen]
+            for item in fresh:
+                f.write(json.dumps(item, ensure_ascii=False, default=str).encode('utf-8'))
+                f.write(b'\n')
+
+            if fresh:
+                last_submitted = fresh[-1].get('submitted_at')
+                if last_submitted != state.get('submitted_at'):
+                    seen = set()
+                seen.update(item.get('token') for item in fresh if item.get('submitted_at') == last_submitted)
+                f.flush()
+                os.fsync(f.fileno())
+                new += len(fresh)
+                total += len(fresh)
+                state = {
+                    'submitted_at': last_submitted,
+                    'token': fresh[-1].get('token'),
+                    'boundary_tokens': sorted(seen),
+                    'response_count': total,
+                    'offset': f.tell(),
+                    'synced_at': datetime.now().isoformat(),
+                }
+                state['fingerprint'] = store_fingerprint(f, state['offset'])
+                checkpoint.update(form_id, state)
+
+            # A full page with nothing new means every response shares one timestamp
+            if len(items) < page_size or not fresh:
+                break
+
+    if not state:
+        checkpoint.update(form_id, {'response_count': 0, 'offset': 0, 'synced_at': datetime.now().isoformat()})
+    return new, total
 
 def save_json(data, filepath):
     """Save data as formatted JSON"""
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False, default=str)
 
-def export_all_data():
-    """Main export function"""
+def download_form_structure(form, index, total):
+    """Fetch and save one form's full structure"""
+    form_id = form['id']
+    form_title = form.get('title', 'Untitled')
+
+    try:
+        # Get full form details
+        form_details = get_form_details(form_id)
+        save_json(form_details, FORMS_DIR / f'{form_id}_structure.json')
+        print(f"  [{index}/{total}] {form_title} ({form_id})")
+    except Exception as e:
+        print(f"  [{index}/{total}] {form_title} ({form_id}) - Error fetching form details: {e}")
+
+def download_form_responses(form, index, total, stream=False, checkpoint=None):
+    """Fetch and save all responses of one form, returning its inventory entry
+
+    With stream=True responses go straight to {form_id}_responses.jsonl page
+    by page instead of being collected into {form_id}_responses.json. Given a
+    checkpoint, only responses newer than the last sync are appended to it.
+    """
+    form_id = form['id']
+    form_title = form.get('title', 'Untitled')
+
+    try:
+        if checkpoint is not None:
+            new_count, response_count = sync_form_responses(
+                form_id, RESPONSES_DIR / f'{form_id}_responses.jsonl', checkpoint)
+            print(f"  [{index}/{total}] {form_title} ({form_id}) - {new_count} new, {response_count} responses")
+        elif stream:
+            response_count = stream_form_responses(form_id, RESPONSES_DIR / f'{form_id}_responses.jsonl')
+            print(f"  [{index}/{total}] {form_title} ({form_id}) - {response_count} responses")
+        else:
+            # Get all responses
+            responses = get_form_responses(form_id)
+            response_count = len(responses)
+
+            print(f"  [{index}/{total}] {form_title} ({form_id}) - {response_count} responses")
+
+            # Save responses
+            save_json({
+                'form_id': form_id,
+                'form_title': form_title,
+                'response_count': response_count,
+                'export_date': datetime.now().isoformat(),
+                'responses': responses
+            }, RESPONSES_DIR / f'{form_id}_responses.json')
+
+        return {
+            'id': form_id,
+            'title': form_title,
+            'type': form.get('type', 'unknown'),
+            'created_at': form.get('created_at'),
+            'last_updated_at': form.get('last_updated_at'),
+            'response_count': response_count,
+            'is_public': form.get('settings', {}).get('is_public', False),
+            'display_url': form.get('_links', {}).get('display', ''),
+        }
+
+    except Exception as e:
+        print(f"  [{index}/{total}] {form_title} ({form_id}) - Error: {e}")
+        return {
+            'id': form_id,
+            'title': form_title,
+            'error': str(e)
+        }
+
+def export_all_data(concurrency=1, stream=False, incremental=False):
+    """Main export function
+
+    With concurrency > 1, pages of the forms list, form structures and
+    responses are downloaded several at once; requests stay under REQUESTS_PER_SECOND overall.
+    With stream=True responses are written as JSONL while pages arrive, and
+    with incremental=True only responses newer than the checkpoint are fetched.
+    """
     ensure_dirs()
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
@@ -110,7 +505,7 @@ def export_all_data():
 
     # Get all forms
     print("\n[2/5] Fetching all forms...")
-    forms = get_all_forms()
+    forms = get_all_forms(workers=concurrency)
     print(f"  Total forms found: {len(forms)}")
 
     # Save forms list
@@ -123,65 +518,19 @@ def export_all_data():
         'forms': []
     }
 
-    total_responses = 0
-
     # Process each form
-    print("\n[3/5] Downloading form structures...")
-    for i, form in enumerate(forms, 1):
-        form_id = form['id']
-        form_title = form.get('title', 'Untitled')
-        print(f"  [{i}/{len(forms)}] {form_title} ({form_id})")
+    positions = range(1, len(forms) + 1)
+    print(f"\n[3/5] Downloading form structures (concurrency {concurrency})...")
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(download_form_structure, forms, positions, repeat(len(forms))))
 
-        try:
-            # Get full form details
-            form_details = get_form_details(form_id)
-            save_json(form_details, FORMS_DIR / f'{form_id}_structure.json')
-        except Exception as e:
-            print(f"    Error fetching form details: {e}")
-            form_details = form
-
-    print("\n[4/5] Downloading all responses...")
-    for i, form in enumerate(forms, 1):
-        form_id = form['id']
-        form_title = form.get('title', 'Untitled')
-        print(f"  [{i}/{len(forms)}] {form_title} ({form_id})", end='')
+        print(f"\n[4/5] Downloading all responses (concurrency {concurrency})...")
+        checkpoint = SyncCheckpoint() if incremental else None
+        entries = pool.map(download_form_responses, forms, positions, repeat(len(forms)),
+                           repeat(stream), repeat(checkpoint))
+        inventory['forms'].extend(entries)
 
-        try:
-            # Get all responses
-            responses = get_form_responses(form_id)
-            response_count = len(responses)
-            total_responses += response_count
-
-            print(f" - {response_count} responses")
-
-            # Save responses
-            save_json({
-                'form_id': form_id,
-                'form_title': form_title,
-                'response_count': response_count,
-                'export_date': datetime.now().isoformat(),
-                'responses': responses
-            }, RESPONSES_DIR / f'{form_id}_responses.json')
-
-            # Add to inventory
-            inventory['forms'].append({
-                'id': form_id,
-                'title': form_title,
-                'type': form.get('type', 'unknown'),
-                'created_at': form.get('created_at'),
-                'last_updated_at': form.get('last_updated_at'),
-                'response_count': response_count,
-                'is_public': form.get('settings', {}).get('is_public', False),
-                'display_url': form.get('_links', {}).get('display', ''),
-            })
-
-        except Exception as e:
-            print(f" - Error: {e}")
-            inventory['forms'].append({
-                'id': form_id,
-                'title': form_title,
-                'error': str(e)
-            })
+    total_responses = sum(entry.get('response_count', 0) for entry in inventory['forms'])
 
     inventory['total_responses'] = total_responses
 
@@ -251,5 +600,18 @@ def export_all_data():
 
     return inventory
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Export all Typeform forms and responses')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='number of forms (and pages of the forms list) to download at once (default: 1)')
+    parser.add_argument('--stream', action='store_true',
+                        help='write responses page by page to {form_id}_responses.jsonl')
+    parser.add_argument('--incremental', action='store_true',
+                        help='append only responses newer than inventory/sync_checkpoint.json '
+                             'to the {form_id}_responses.jsonl store')
+    return parser.parse_args()
+
 if __name__ == '__main__':
-    export_all_data()
+    args = parse_args()
+    export_all_data(concurrency=max(1, args.concurrency), stream=args.stream,
+                    incremental=args.incremental)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Local Typeform API stub for exercising the export scripts offline
+Serves deterministic fake forms and responses with optional latency:
+
+    python scripts/typeform_stub_server.py --forms 50 --responses 300 --latency 0.2
+    TYPEFORM_API_KEY=stub TYPEFORM_BASE_URL=http://127.0.0.1:8765 \\
+        TYPEFORM_EXPORT_DIR=/tmp/typeform python scripts/typeform_full_export.py
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+EPOCH = datetime(2024, 1, 1)
+
+
+def build_forms(form_count, responses_per_form):
+    """Create the fake account: form listing entries and their responses"""
+    forms = []
+    responses = {}
+    for index in range(form_count):
+        form_id = f'form{index:04d}'
+        forms.append({
+            'id': form_id,
+            'title': f'Periospot Quiz {index}',
+            'type': 'quiz',
+            'created_at': (EPOCH + timedelta(days=index)).isoformat() + 'Z',
+            'last_updated_at': (EPOCH + timedelta(days=index + 1)).isoformat() + 'Z',
+            'settings': {'is_public': True},
+            '_links': {'display': f'https://form.typeform.com/to/{form_id}'},
+        })
+        count = responses_per_form + (index % 7)
+        # Newest first, as Typeform returns them by default
+        responses[form_id] = [
+            {
+                'token': f'{form_id}-r{n:06d}',
+                'response_id': f'{form_id}-r{n:06d}',
+                'landed_at': (EPOCH + timedelta(minutes=n)).isoformat() + 'Z',
+                # Pairs of responses share a timestamp, as happens with bulk submissions
+                'submitted_at': (EPOCH + timedelta(minutes=n // 2 * 2, seconds=30)).isoformat() + 'Z',
+                'answers': [
+                    {'type': 'email', 'email': f'user{n}@example.com', 'field': {'ref': 'email'}},
+                    {'type': 'choice', 'choice': {'label': 'Yes'}, 'field': {'ref': 'q1'}},
+                ],
+                'variables': [{'key': 'score', 'type': 'number', 'number': n % 10}],
+            }
+            for n in reversed(range(count))
+        ]
+    return forms, responses
+
+
+def form_structure(form):
+    return {
+        **form,
+        'settings': {'is_public': True, 'language': 'en'},
+        'fields': [
+            {'ref': 'email', 'type': 'email', 'title': 'Email'},
+            {
+                'ref': 'q1', 'type': 'multiple_choice', 'title': 'Is this a stub?',
+                'properties': {'choices': [{'ref': 'yes', 'label': 'Yes'}, {'ref': 'no', 'label': 'No'}]},
+            },
+        ],
+        'thankyou_screens': [],
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    forms = []
+    responses = {}
+    latency = 0.0
+    rate_limit = 0
+    request_times = []
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200, conditional=False):
+        """Send `payload`; with conditional=True honour If-None-Match with an ETag"""
+        body = json.dumps(payload).encode('utf-8')
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if conditional and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if conditional:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def rate_limited(self):
+        """Record this request and report whether it exceeds --rate-limit per second"""
+        if not self.rate_limit:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            recent = [t for t in self.request_times if now - t < 1]
+            limited = len(recent) >= self.rate_limit
+            if not limited:
+                recent.append(now)
+            StubHandler.request_times = recent
+        return limited
+
+    def do_GET(self):
+        if self.rate_limited():
+            body = b'{"code": "TOO_MANY_REQUESTS"}'
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+
+        if parts == ['me']:
+            return self.send_json({'alias': 'stub-account'})
+        if parts == ['forms']:
+            return self.list_forms(query)
+        if len(parts) >= 2 and parts[0] == 'forms':
+            form = next((f for f in self.forms if f['id'] == parts[1]), None)
+            if form is None:
+                return self.send_json({'code': 'FORM_NOT_FOUND'}, status=404)
+            if len(parts) == 2:
+                return self.send_json(form_structure(form))
+            if parts[2:] == ['responses']:
+                return self.list_responses(form['id'], query)
+        return self.send_json({'code': 'NOT_FOUND'}, status=404)
+
+    def list_forms(self, query):
+        page = int(query.get('page', 1))
+        page_size = min(int(query.get('page_size', 10)), 200)
+        start = (page - 1) * page_size
+        return self.send_json({
+            'total_items': len(self.forms),
+            'page_count': max(1, -(-len(self.forms) // page_size)),
+            'items': self.forms[start:start + page_size],
+        }, conditional=True)
+
+    def list_responses(self, form_id, query):
+        items = self.responses[form_id]
+        page_size = min(int(query.get('page_size', 25)), 1000)
+        if query.get('since'):
+            items = [item for item in items if item['submitted_at'] >= query['since']]
+        if query.get('sort') == 'submitted_at,asc':
+            items = items[::-1]
+        before = query.get('before')
+        if before:
+            tokens = [item['token'] for item in items]
+            items = items[tokens.index(before) + 1:] if before in tokens else []
+        return self.send_json({
+            'total_items': len(items),
+            'page_count': max(1, -(-len(items) // page_size)),
+            'items': items[:page_size],
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Typeform API stub')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--forms', type=int, default=20)
+    parser.add_argument('--responses', type=int, default=50, help='responses per form (plus a small offset)')
+    parser.add_argument('--latency', type=float, default=0.1, help='seconds of delay per request')
+    parser.add_argument('--rate-limit', type=int, default=0,
+                        help='answer 429 beyond this many requests per second (0 = unlimited)')
+    args = parser.parse_args()
+
+    StubHandler.forms, StubHandler.responses = build_forms(args.forms, args.responses)
+    StubHandler.latency = args.latency
+    StubHandler.rate_limit = args.rate_limit
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StubHandler)
+    print(f"Typeform stub listening on http://127.0.0.1:{args.port} ({args.forms} forms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
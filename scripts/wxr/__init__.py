@@ -0,0 +1,48 @@
+"""Shared WordPress export (WXR) parsing for the legacy content generators."""
+
+from .comments import (
+    build_comments,
+    extract_comments,
+    extract_comments_streaming,
+    iter_comments,
+    thread_comments,
+)
+from .extractor import SINKS, Sink, extract_all, run_sinks
+from .posts import FeaturedImageResolver, build_post, extract_posts, extract_posts_streaming, iter_posts
+from .reader import NAMESPACES, ChildFields, get_channel, iter_channel, iter_items, load_xml
+from .rewrite import UrlRewriter, load_rewriter
+from .store import StoreWriter, open_store, write_and_store
+from .writer import RecordWriter, TeeWriter, open_writer, output_path_for, write_records
+
+__all__ = [
+    "NAMESPACES",
+    "ChildFields",
+    "RecordWriter",
+    "SINKS",
+    "StoreWriter",
+    "TeeWriter",
+    "UrlRewriter",
+    "FeaturedImageResolver",
+    "Sink",
+    "build_comments",
+    "build_post",
+    "extract_all",
+    "extract_comments",
+    "extract_comments_streaming",
+    "extract_posts",
+    "extract_posts_streaming",
+    "get_channel",
+    "iter_channel",
+    "iter_comments",
+    "iter_items",
+    "iter_posts",
+    "load_rewriter",
+    "load_xml",
+    "open_store",
+    "open_writer",
+    "output_path_for",
+    "run_sinks",
+    "thread_comments",
+    "write_and_store",
+    "write_records",
+]
@@ -0,0 +1,174 @@
+"""Publish converter outputs as content-hashed, precompressed artifacts.
+
+Next to every output file, e.g. posts.json, go a copy named after its
+content hash and compressed variants of that copy:
+
+    posts.3f2a9c0d1e4b5a67.json
+    posts.3f2a9c0d1e4b5a67.json.gz
+    posts.3f2a9c0d1e4b5a67.json.br     (when `brotli` is installed)
+    posts.3f2a9c0d1e4b5a67.json.zst    (when `zstandard` is installed)
+
+artifacts.json in the same directory maps each output to its hash, size
+and variants, so a build or cache can key on the hash. An output whose
+content hash has not changed is not rewritten, which keeps its mtime and
+its variants as they were.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Optional: extra encodings are produced only when their packages are installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MANIFEST_NAME = "artifacts.json"
+HASH_LENGTH = 16
+CHUNK_SIZE = 1024 * 1024
+# The top brotli/zstd levels shrink posts.json by a few more percent but take
+# 50-100x longer; these stay within a second or two on the full export.
+BROTLI_QUALITY = 9
+ZSTD_LEVEL = 15
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _gzip(source: Path, target: Path) -> None:
+    # A fixed mtime and no embedded name keep the archive reproducible.
+    with source.open("rb") as src, target.open("wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+
+def _brotli(source: Path, target: Path) -> None:
+    compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+    with source.open("rb") as src, target.open("wb") as dst:
+        while chunk := src.read(CHUNK_SIZE):
+            dst.write(compressor.process(chunk))
+        dst.write(compressor.finish())
+
+
+def _zstd(source: Path, target: Path) -> None:
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    with source.open("rb") as src, target.open("wb") as dst:
+        compressor.copy_stream(src, dst)
+
+
+def available_encodings() -> dict[str, tuple[str, Callable[[Path, Path], None]]]:
+    """Encoding name -> (file suffix, compressor) for what is installed here."""
+    encodings = {"gzip": (".gz", _gzip)}
+    if brotli is not None:
+        encodings["br"] = (".br", _brotli)
+    if zstandard is not None:
+        encodings["zstd"] = (".zst", _zstd)
+    return encodings
+
+
+def hashed_name(path: Path, digest: str) -> str:
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+
+def load_manifest(path: Path) -> dict[str, dict[str, object]]:
+    """Return the artifact manifest, or an empty one if it is missing or unreadable.
+
+    A truncated or corrupt manifest is treated as empty and rewritten by the
+    next `publish`.
+    """
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_manifest(path: Path, manifest: dict[str, dict[str, object]]) -> None:
+    staging = path.with_name(f"{path.name}.tmp")
+    staging.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(staging, path)
+
+
+def publish(staging: Path, path: Path) -> bool:
+    """Move a freshly written `staging` file to `path` and publish its artifacts.
+
+    Returns False when `path` already held the same content; it is then
+    left untouched and only missing variants are created.
+    """
+    digest = file_sha256(staging)
+    changed = not path.exists() or file_sha256(path) != digest
+    if changed:
+        os.replace(staging, path)
+    else:
+        staging.unlink()
+
+    manifest_path = path.with_name(MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    previous = manifest.get(path.name, {})
+
+    plain = path.with_name(hashed_name(path, digest))
+    if not plain.exists():
+        shutil.copyfile(path, plain)
+    variants: dict[str, dict[str, object]] = {}
+    for encoding, (suffix, compress) in available_encodings().items():
+        target = plain.with_name(plain.name + suffix)
+        if not target.exists():
+            partial = target.with_name(f"{target.name}.tmp")
+            compress(plain, partial)
+            os.replace(partial, target)
+        variants[encoding] = {"file": target.name, "size": target.stat().st_size}
+
+    entry = {"sha256": digest, "size": plain.stat().st_size, "file": plain.name, "variants": variants}
+    if entry != previous:
+        current = {entry["file"], *(variant["file"] for variant in variants.values())}
+        stale = {previous.get("file"), *(variant["file"] for variant in previous.get("variants", {}).values())}
+        for name in stale - current - {None}:
+            path.with_name(name).unlink(missing_ok=True)
+        manifest[path.name] = entry
+        save_manifest(manifest_path, manifest)
+    return changed
+
+
+class Artifact:
+    """Where to write an output that `open_artifact` publishes on success."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.staging = path.with_name(f".{path.name}.tmp")
+        self.changed: bool | None = None
+
+
+@contextmanager
+def open_artifact(path: Path) -> Iterator[Artifact]:
+    """Yield an `Artifact` whose `staging` file is published when the block exits.
+
+    After the block, `changed` tells whether the output content differed
+    from what was already on disk. A failed run leaves the old output alone.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    artifact = Artifact(path)
+    try:
+        yield artifact
+        artifact.changed = publish(artifact.staging, path)
+    finally:
+        artifact.staging.unlink(missing_ok=True)
@@ -0,0 +1,136 @@
+"""Build comments.json records from the `<wp:comment>` children of post items."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+from .reader import NAMESPACES, ChildFields, iter_items
+
+
+def normalize_status(value: str) -> str:
+    normalized = value.strip().lower()
+    if normalized in {"1", "approved", "approve", "publish"}:
+        return "approved"
+    if normalized in {"0", "hold", "pending"}:
+        return "pending"
+    if normalized == "spam":
+        return "spam"
+    if normalized in {"trash", "deleted", "delete"}:
+        return "deleted"
+    return "pending"
+
+
+def build_comments(item: ET.Element, fields: ChildFields | None = None) -> list[dict[str, object]]:
+    """Return the comment records attached to a `post` item."""
+    comments: list[dict[str, object]] = []
+    item_field = fields or ChildFields(item)
+    wordpress_post_id = item_field("wp:post_id")
+    slug = item_field("wp:post_name")
+
+    for comment in item.findall("wp:comment", namespaces=NAMESPACES):
+        field = ChildFields(comment)
+        comment_type = field("wp:comment_type").strip().lower()
+        if comment_type not in {"", "comment"}:
+            continue
+
+        content = field("wp:comment_content").strip()
+        if not content:
+            continue
+
+        comment_id = field("wp:comment_id")
+        parent_id = field("wp:comment_parent")
+        approved = field("wp:comment_approved")
+        created_at = field("wp:comment_date_gmt") or field("wp:comment_date")
+
+        status = normalize_status(approved)
+        approved_at = created_at if status == "approved" else ""
+
+        comments.append(
+            {
+                "legacy_comment_id": int(comment_id) if comment_id.isdigit() else comment_id,
+                "wordpress_post_id": int(wordpress_post_id)
+                if wordpress_post_id.isdigit()
+                else wordpress_post_id,
+                "post_slug": slug,
+                "parent_legacy_id": int(parent_id) if parent_id.isdigit() else parent_id,
+                "author_name": field("wp:comment_author"),
+                "author_email": field("wp:comment_author_email"),
+                "author_url": field("wp:comment_author_url"),
+                "content": content,
+                "status": status,
+                "created_at": created_at,
+                "approved_at": approved_at,
+                "ip_address": field("wp:comment_author_IP"),
+                "user_agent": field("wp:comment_agent"),
+            }
+        )
+
+    return comments
+
+
+def thread_comments(comments: list[dict[str, object]]) -> list[dict[str, object]]:
+    """Order one post's comments parent-first and annotate their place in the thread.
+
+    Each comment gets `depth` (0 for top-level), `thread_root_legacy_id` and
+    `is_orphan`. A comment is an orphan when its parent was not exported or
+    was filtered out (pingbacks, empty content), or when it sits on a parent
+    cycle. Orphans are placed at depth 0. The returned list is sorted by
+    depth and keeps export order within each level, so every row comes after
+    its parent and an importer can insert level by level.
+    """
+    index = {comment["legacy_comment_id"]: comment for comment in comments}
+    placement: dict[object, tuple[int, object, bool]] = {}
+
+    for comment in comments:
+        path: list[dict[str, object]] = []
+        positions: dict[object, int] = {}
+        node = comment
+        while node["legacy_comment_id"] not in placement:
+            node_id = node["legacy_comment_id"]
+            parent_id = node["parent_legacy_id"]
+            if not parent_id:
+                placement[node_id] = (0, node_id, False)
+                break
+            parent = index.get(parent_id)
+            if parent is None or node_id in positions:
+                placement[node_id] = (0, node_id, True)
+                if node_id in positions:
+                    # Comments above the cycle point are placed on their own turn.
+                    path = path[: positions[node_id]]
+                break
+            positions[node_id] = len(path)
+            path.append(node)
+            node = parent
+
+        depth, root_id, _ = placement[node["legacy_comment_id"]]
+        for child in reversed(path):
+            depth += 1
+            placement[child["legacy_comment_id"]] = (depth, root_id, False)
+
+    threaded: list[dict[str, object]] = []
+    for comment in comments:
+        depth, root_id, is_orphan = placement[comment["legacy_comment_id"]]
+        threaded.append(
+            {**comment, "depth": depth, "thread_root_legacy_id": root_id, "is_orphan": is_orphan}
+        )
+    threaded.sort(key=lambda comment: comment["depth"])
+    return threaded
+
+
+def iter_comments(items: Iterable[ET.Element], threaded: bool = False) -> Iterator[dict[str, object]]:
+    for item in items:
+        fields = ChildFields(item)
+        if fields("wp:post_type") != "post":
+            continue
+        comments = build_comments(item, fields)
+        yield from thread_comments(comments) if threaded else comments
+
+
+def extract_comments(channel: ET.Element, threaded: bool = False) -> list[dict[str, object]]:
+    return list(iter_comments(channel.findall("item"), threaded))
+
+
+def extract_comments_streaming(path: Path, threaded: bool = False) -> list[dict[str, object]]:
+    return list(iter_comments(iter_items(path), threaded))
@@ -0,0 +1,73 @@
+"""Build pages, attachments, authors and categories records from a WXR export."""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+
+from .posts import extract_categories, extract_meta
+from .reader import ChildFields
+from .seo import SEO_MAPPING, SeoMapping, build_seo
+
+
+def build_page(
+    item: ET.Element, fields: ChildFields | None = None, seo_mapping: SeoMapping = SEO_MAPPING
+) -> tuple[dict[str, object], str]:
+    """Return the pages.json record for a `page` item and its `_thumbnail_id`."""
+    field = fields or ChildFields(item)
+    categories, tags = extract_categories(item)
+    meta = extract_meta(item)
+
+    page: dict[str, object] = {
+        "id": field("wp:post_id"),
+        "title": field("title"),
+        "link": field("link"),
+        "pubDate": field("pubDate"),
+        "creator": field("dc:creator"),
+        "content": field("content:encoded"),
+        "excerpt": field("excerpt:encoded"),
+        "post_name": field("wp:post_name"),
+        "post_type": field("wp:post_type"),
+        "post_status": field("wp:status"),
+        "featured_media": "",
+        "categories": categories,
+        "tags": tags,
+        "meta": meta,
+        "seo": build_seo(meta, seo_mapping),
+    }
+    return page, meta.get("_thumbnail_id", "")
+
+
+def build_attachment(item: ET.Element, fields: ChildFields | None = None) -> dict[str, object]:
+    field = fields or ChildFields(item)
+    wordpress_id = field("wp:post_id")
+    parent_id = field("wp:post_parent")
+    return {
+        "id": int(wordpress_id) if wordpress_id.isdigit() else wordpress_id,
+        "title": field("title"),
+        "slug": field("wp:post_name"),
+        "url": field("wp:attachment_url"),
+        "parent_id": int(parent_id) if parent_id.isdigit() else parent_id,
+        "date": field("wp:post_date"),
+    }
+
+
+def build_author(element: ET.Element) -> dict[str, object]:
+    field = ChildFields(element)
+    return {
+        "id": field("wp:author_id"),
+        "login": field("wp:author_login"),
+        "email": field("wp:author_email"),
+        "display_name": field("wp:author_display_name"),
+        "first_name": field("wp:author_first_name"),
+        "last_name": field("wp:author_last_name"),
+    }
+
+
+def build_category(element: ET.Element) -> dict[str, object]:
+    field = ChildFields(element)
+    return {
+        "id": field("wp:term_id"),
+        "name": field("wp:cat_name"),
+        "nicename": field("wp:category_nicename"),
+        "description": field("wp:category_description"),
+    }
@@ -0,0 +1,166 @@
+"""Run several per-item sinks over a single parse of a WXR export.
+
+Every sink sees each direct child of `<channel>` exactly once, so a full
+regeneration of the legacy content costs one XML pass no matter how many
+output files are written.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+from .comments import build_comments
+from .content import build_attachment, build_author, build_category, build_page
+from .posts import FeaturedImageResolver, build_post
+from .reader import NAMESPACES, ChildFields, iter_channel
+from .rewrite import UrlRewriter
+from .seo import SEO_MAPPING, SeoMapping
+from .writer import RecordWriter
+
+AUTHOR_TAG = f"{{{NAMESPACES['wp']}}}author"
+CATEGORY_TAG = f"{{{NAMESPACES['wp']}}}category"
+
+
+class Sink:
+    """Produces the records of one output file from the stream of channel elements.
+
+    Records go to `writer` as soon as they are ready; without a writer they
+    are collected in `records`.
+    """
+
+    filename = ""
+
+    def __init__(self, writer: RecordWriter | None = None) -> None:
+        self.writer = writer
+        self.records: list[dict[str, object]] = []
+        self.count = 0
+
+    def emit(self, records: Iterable[dict[str, object]]) -> None:
+        for record in records:
+            if self.writer is not None:
+                self.writer.write(record)
+            else:
+                self.records.append(record)
+            self.count += 1
+
+    def handle_item(self, item: ET.Element, post_type: str, fields: ChildFields) -> None:
+        pass
+
+    def handle_channel_element(self, element: ET.Element) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class PostsSink(Sink):
+    """Posts, with migrated media URLs rewritten when given a `UrlRewriter`."""
+
+    filename = "posts.json"
+
+    def __init__(
+        self,
+        writer: RecordWriter | None = None,
+        seo_mapping: SeoMapping = SEO_MAPPING,
+        rewriter: UrlRewriter | None = None,
+    ) -> None:
+        super().__init__(writer)
+        self.resolver = FeaturedImageResolver()
+        self.seo_mapping = seo_mapping
+        self.rewriter = rewriter
+
+    def emit(self, records: Iterable[dict[str, object]]) -> None:
+        # Records arrive with their featured image resolved, so the rewrite covers it too.
+        super().emit(self.rewriter.rewrite_posts(records) if self.rewriter else records)
+
+    def handle_item(self, item: ET.Element, post_type: str, fields: ChildFields) -> None:
+        if post_type == "attachment":
+            self.emit(self.resolver.add_item(item, fields))
+        elif post_type == "post":
+            self.emit(self.resolver.add_record(*build_post(item, fields, self.seo_mapping)))
+
+    def close(self) -> None:
+        self.emit(self.resolver.finish())
+
+
+class CommentsSink(Sink):
+    filename = "comments.json"
+
+    def handle_item(self, item: ET.Element, post_type: str, fields: ChildFields) -> None:
+        if post_type == "post":
+            self.emit(build_comments(item, fields))
+
+
+class PagesSink(Sink):
+    filename = "pages.json"
+
+    def __init__(self, writer: RecordWriter | None = None, seo_mapping: SeoMapping = SEO_MAPPING) -> None:
+        super().__init__(writer)
+        self.resolver = FeaturedImageResolver(field="featured_media")
+        self.seo_mapping = seo_mapping
+
+    def handle_item(self, item: ET.Element, post_type: str, fields: ChildFields) -> None:
+        if post_type == "attachment":
+            self.emit(self.resolver.add_item(item, fields))
+        elif post_type == "page":
+            self.emit(self.resolver.add_record(*build_page(item, fields, self.seo_mapping)))
+
+    def close(self) -> None:
+        self.emit(self.resolver.finish())
+
+
+class AttachmentsSink(Sink):
+    filename = "attachments.json"
+
+    def handle_item(self, item: ET.Element, post_type: str, fields: ChildFields) -> None:
+        if post_type == "attachment":
+            self.emit([build_attachment(item, fields)])
+
+
+class AuthorsSink(Sink):
+    filename = "authors.json"
+
+    def handle_channel_element(self, element: ET.Element) -> None:
+        if element.tag == AUTHOR_TAG:
+            self.emit([build_author(element)])
+
+
+class CategoriesSink(Sink):
+    filename = "categories.json"
+
+    def handle_channel_element(self, element: ET.Element) -> None:
+        if element.tag == CATEGORY_TAG:
+            self.emit([build_category(element)])
+
+
+SINKS: dict[str, type[Sink]] = {
+    "posts": PostsSink,
+    "comments": CommentsSink,
+    "pages": PagesSink,
+    "attachments": AttachmentsSink,
+    "authors": AuthorsSink,
+    "categories": CategoriesSink,
+}
+
+
+def run_sinks(elements: Iterable[ET.Element], sinks: Sequence[Sink]) -> None:
+    """Dispatch every channel element to every sink, then close the sinks."""
+    for element in elements:
+        if element.tag == "item":
+            fields = ChildFields(element)
+            post_type = fields("wp:post_type")
+            for sink in sinks:
+                sink.handle_item(element, post_type, fields)
+        else:
+            for sink in sinks:
+                sink.handle_channel_element(element)
+
+    for sink in sinks:
+        sink.close()
+
+
+def extract_all(path: Path, sinks: Sequence[Sink]) -> None:
+    run_sinks(iter_channel(path), sinks)
+
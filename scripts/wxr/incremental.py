@@ -0,0 +1,197 @@
+"""Incremental posts.json regeneration keyed on a hash of each raw `<item>`.
+
+The export is split into raw item fragments without building a DOM (see
+`wxr.parallel.iter_item_fragments`). A fragment whose bytes hash the same as
+in the last run is not parsed at all: its post is read back from a record
+cache next to the output and its attachment URL from the manifest. Any edit
+to an item, including a bumped `post_modified_gmt` or postmeta written by a
+plugin, changes its hash.
+
+The record cache is a JSON Lines file of posts as `build_post` returns them,
+before featured images are resolved and URLs rewritten. The manifest maps
+each item hash to the byte range and CRC of its record, so records are read
+one at a time instead of loading the previous output. The manifest header also
+records the options the posts were built with (SEO plugins, the URL rewrite
+mapping) and a generation token shared with the cache. If any of them
+differs, everything is rebuilt.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+import zlib
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+from .parallel import iter_item_fragments, parse_fragment, read_root_tag
+from .posts import FeaturedImageResolver, build_post
+from .reader import ChildFields
+from .rewrite import UrlRewriter
+from .seo import SEO_MAPPING, SeoMapping
+
+MANIFEST_VERSION = 4
+
+ManifestEntry = dict[str, object]
+
+
+def manifest_path_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.manifest.json")
+
+
+def cache_path_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.cache.jsonl")
+
+
+def manifest_options(seo_mapping: SeoMapping = SEO_MAPPING, rewriter: UrlRewriter | None = None) -> dict[str, object]:
+    """The settings a manifest's records depend on; a change forces a full rebuild."""
+    return {
+        "seo_plugins": list(seo_mapping.plugins),
+        "rewrite_urls": rewriter.fingerprint() if rewriter else None,
+    }
+
+
+def _read_generation(cache_path: Path) -> str | None:
+    try:
+        with cache_path.open("rb") as handle:
+            return json.loads(handle.readline()).get("generation")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def load_manifest(path: Path, options: dict[str, object], cache_path: Path) -> dict[str, ManifestEntry]:
+    """Return the item hash -> entry map, or an empty map if nothing can be reused.
+
+    That is the case when the manifest is missing, unreadable or stale, was
+    built with other `options`, or does not belong to the cache at `cache_path`.
+    """
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    if data.get("options") != options:
+        return {}
+    if data.get("generation") is None or data["generation"] != _read_generation(cache_path):
+        return {}
+    return data.get("items", {})
+
+
+def save_manifest(
+    path: Path, entries: dict[str, ManifestEntry], options: dict[str, object], generation: str
+) -> None:
+    data = {"version": MANIFEST_VERSION, "options": options, "generation": generation, "items": entries}
+    partial = path.with_name(f".{path.name}.partial")
+    # Compact, so json uses its C encoder; nobody reads this file by hand.
+    partial.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(partial, path)
+
+
+class RecordCache:
+    """Reads records of the previous cache by byte range and writes the next one."""
+
+    def __init__(self, previous: BinaryIO | None, current: BinaryIO) -> None:
+        self.previous = previous
+        self.current = current
+        self.generation = uuid.uuid4().hex
+        current.write(json.dumps({"generation": self.generation}).encode("utf-8") + b"\n")
+
+    def read(self, entry: ManifestEntry) -> bytes | None:
+        """Return the raw record line of `entry`, or None if it cannot be read back intact."""
+        if self.previous is None or "offset" not in entry:
+            return None
+        self.previous.seek(entry["offset"])
+        line = self.previous.read(entry["length"])
+        return line if zlib.crc32(line) == entry.get("crc") else None
+
+    def write(self, line: bytes, entry: ManifestEntry) -> None:
+        entry["offset"] = self.current.tell()
+        entry["length"] = len(line)
+        entry["crc"] = zlib.crc32(line)
+        self.current.write(line)
+
+
+@contextmanager
+def open_record_cache(path: Path) -> Iterator[RecordCache]:
+    """Yield a `RecordCache` whose new records replace `path` when the block succeeds."""
+    partial = path.with_name(f".{path.name}.partial")
+    previous = path.open("rb") if path.exists() else None
+    try:
+        with partial.open("wb") as current:
+            cache = RecordCache(previous, current)
+            yield cache
+        os.replace(partial, path)
+    finally:
+        if previous is not None:
+            previous.close()
+        partial.unlink(missing_ok=True)
+
+
+def fingerprint_fragment(fragment: bytes) -> str:
+    return hashlib.sha256(fragment).hexdigest()
+
+
+def iter_posts_incremental(
+    path: Path,
+    cache: RecordCache,
+    manifest: dict[str, ManifestEntry],
+    updated_manifest: dict[str, ManifestEntry],
+    stats: Counter[str],
+    seo_mapping: SeoMapping = SEO_MAPPING,
+) -> Iterator[dict[str, object]]:
+    """Yield posts in export order, reusing unchanged records from the last run.
+
+    `updated_manifest` is filled with an entry for every item seen, pointing
+    into the new record cache, ready to be saved once the output is written.
+    """
+    root_tag = read_root_tag(path)
+    resolver = FeaturedImageResolver()
+    seen_posts: set[str] = set()
+
+    for fragment in iter_item_fragments(path):
+        digest = fingerprint_fragment(fragment)
+        previous = manifest.get(digest)
+        post = None
+        line = None
+        if previous is not None and previous["type"] == "post":
+            line = cache.read(previous)
+            try:
+                post = json.loads(line) if line is not None else None
+            except ValueError:
+                post = None
+
+        if previous is None or (previous["type"] == "post" and post is None):
+            item = parse_fragment(fragment, root_tag)
+            fields = ChildFields(item)
+            entry: ManifestEntry = {"type": fields("wp:post_type"), "id": fields("wp:post_id")}
+            if entry["type"] == "attachment":
+                entry["url"] = fields("wp:attachment_url")
+            elif entry["type"] == "post":
+                post, entry["thumbnail_id"] = build_post(item, fields, seo_mapping)
+                line = (json.dumps(post, ensure_ascii=False) + "\n").encode("utf-8")
+                stats["extracted"] += 1
+        else:
+            entry = {key: value for key, value in previous.items() if key not in ("offset", "length", "crc")}
+            if post is not None:
+                stats["reused"] += 1
+
+        if entry["type"] == "post":
+            cache.write(line, entry)
+        updated_manifest[digest] = entry
+        if entry["type"] == "attachment":
+            yield from resolver.add_attachment(entry["id"], entry["url"])
+        elif entry["type"] == "post":
+            seen_posts.add(entry["id"])
+            yield from resolver.add_record(post, entry["thumbnail_id"])
+
+    yield from resolver.finish()
+    previous_ids = {entry["id"] for entry in manifest.values() if entry["type"] == "post"}
+    stats["removed"] = len(previous_ids - seen_posts)
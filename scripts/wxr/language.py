@@ -0,0 +1,84 @@
+"""Precomputed post language detection from categories, tags, slug and title.
+
+`LANGUAGE_TOKENS` is ordered by priority: when a post matches tokens of
+several languages, the earlier language wins. Adding a language (it, fr, de,
+...) adds one substring check per token to the slug/title test of each post.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+LANGUAGE_TOKENS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("es", ("espanol", "español", "spanish")),
+    ("pt", ("portugues", "português", "portuguese")),
+    ("zh", ("chinese", "中文", "chino")),
+)
+
+DEFAULT_LANGUAGE = "en"
+
+
+class LanguageDetector:
+    """Substring token matcher with per-name and per-taxonomy caches.
+
+    Category and tag names repeat across posts, so their language rank is
+    computed once per name and once per (categories, tags) combination.
+    Only the slug and title are checked for each post, lowercased together
+    once, and only for tokens ranked above what the taxonomy already found.
+    """
+
+    def __init__(
+        self,
+        table: Sequence[tuple[str, Iterable[str]]] = LANGUAGE_TOKENS,
+        default: str = DEFAULT_LANGUAGE,
+    ) -> None:
+        self.languages = [language for language, _ in table]
+        self.default = default
+        self.no_match = len(self.languages)
+        self.token_ranks: dict[str, int] = {}
+        for rank, (_, tokens) in enumerate(table):
+            for token in tokens:
+                self.token_ranks.setdefault(token.lower(), rank)
+        # Plain `in` checks in rank order beat a compiled alternation on
+        # short strings; the first token found is the best-ranked one.
+        self.ordered_tokens = sorted(self.token_ranks.items(), key=lambda entry: entry[1])
+        self._name_ranks: dict[str, int] = {}
+        self._taxonomy_ranks: dict[tuple[tuple[str, ...], tuple[str, ...]], int] = {}
+
+    def rank(self, text: str, below: int | None = None) -> int:
+        """Return the best rank of a token in `text`, checking only ranks under `below`."""
+        limit = self.no_match if below is None else below
+        text = text.lower()
+        for token, rank in self.ordered_tokens:
+            if rank >= limit:
+                break
+            if token in text:
+                return rank
+        return limit
+
+    def taxonomy_rank(self, categories: Sequence[str], tags: Sequence[str]) -> int:
+        key = (tuple(categories), tuple(tags))
+        rank = self._taxonomy_ranks.get(key)
+        if rank is None:
+            rank = self.no_match
+            for name in key[0] + key[1]:
+                name_rank = self._name_ranks.get(name)
+                if name_rank is None:
+                    name_rank = self._name_ranks[name] = self.rank(name)
+                rank = min(rank, name_rank)
+            self._taxonomy_ranks[key] = rank
+        return rank
+
+    def detect(self, categories: Sequence[str], tags: Sequence[str], slug: str, title: str) -> str:
+        rank = self.taxonomy_rank(categories, tags)
+        if rank > 0:
+            # The space keeps a token from matching across the slug/title join.
+            rank = self.rank(f"{slug} {title}", rank)
+        return self.languages[rank] if rank < self.no_match else self.default
+
+
+LANGUAGE_DETECTOR = LanguageDetector()
+
+
+def detect_language(categories: list[str], tags: list[str], slug: str, title: str) -> str:
+    return LANGUAGE_DETECTOR.detect(categories, tags, slug, title)
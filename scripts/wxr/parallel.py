@@ -0,0 +1,184 @@
+"""Extract posts across a process pool from raw `<item>` fragments.
+
+The parent process never builds a DOM: it splits the export into the byte
+ranges of each `<item>` and hands batches of them to workers, which parse and
+convert them. Results come back in submission order and go through the same
+FeaturedImageResolver as the serial path, so the output is byte-identical.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+from .posts import FeaturedImageResolver, build_post
+from .reader import ChildFields, find_xml_start
+from .seo import SEO_MAPPING, SeoMapping, seo_mapping_for
+
+ITEM_MARKERS = re.compile(rb"<item>|</item>|<!\[CDATA\[|<!--")
+MARKER_LOOKBACK = len(b"<![CDATA[") - 1
+ROOT_TAG = re.compile(rb"<(?!\?|!)([\w:.-]+)[^>]*>")
+
+ItemResult = tuple[str, object, str]
+
+_root_open = b""
+_root_close = b""
+_seo_mapping = SEO_MAPPING
+
+
+def read_root_tag(path: Path, limit: int = 1 << 16) -> bytes:
+    """Return the opening tag of the document element, with its xmlns declarations."""
+    with path.open("rb") as handle:
+        handle.seek(find_xml_start(handle))
+        head = handle.read(limit)
+    match = ROOT_TAG.search(head)
+    if match is None:
+        raise ValueError("Invalid WordPress export: root element not found")
+    return match.group(0)
+
+
+def iter_item_fragments(path: Path, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """Yield the raw bytes of each `<item>...</item>` without parsing the XML.
+
+    CDATA sections and comments are skipped over, so markup quoted inside post
+    content cannot be mistaken for an item boundary. Inside an item the scan
+    first jumps to the next `</item>`: when no comment precedes it and every
+    CDATA section opened before it is closed, it is the real end of the item
+    (`]]>` cannot occur outside CDATA in well-formed XML). Otherwise the
+    markers are walked one by one.
+    """
+    with path.open("rb") as handle:
+        handle.seek(find_xml_start(handle))
+        buffer = b""
+        position = 0
+        item_start = -1
+        closer: bytes | None = None
+
+        while True:
+            if closer is not None:
+                index = buffer.find(closer, position)
+                if index != -1:
+                    position = index + len(closer)
+                    closer = None
+                    continue
+                position = max(position, len(buffer) - len(closer) + 1)
+            else:
+                if item_start != -1:
+                    end = buffer.find(b"</item>", position)
+                    if end != -1:
+                        span = buffer[position:end]
+                        if b"<!--" not in span and span.count(b"<![CDATA[") == span.count(b"]]>"):
+                            yield buffer[item_start : end + len(b"</item>")]
+                            item_start = -1
+                            position = end + len(b"</item>")
+                            continue
+                match = ITEM_MARKERS.search(buffer, position)
+                if match is not None:
+                    token = match.group()
+                    if token == b"<![CDATA[":
+                        closer = b"]]>"
+                    elif token == b"<!--":
+                        closer = b"-->"
+                    elif token == b"<item>":
+                        item_start = match.start()
+                    elif item_start != -1:
+                        yield buffer[item_start : match.end()]
+                        item_start = -1
+                    position = match.end()
+                    continue
+                position = max(position, len(buffer) - MARKER_LOOKBACK)
+
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                return
+            keep_from = item_start if item_start != -1 else position
+            buffer = buffer[keep_from:] + chunk
+            position -= keep_from
+            if item_start != -1:
+                item_start = 0
+
+
+def closing_tag(root_tag: bytes) -> bytes:
+    return b"</" + ROOT_TAG.match(root_tag).group(1) + b">"
+
+
+def _init_worker(root_tag: bytes, seo_plugins: tuple[str, ...]) -> None:
+    global _root_open, _root_close, _seo_mapping
+    _root_open = root_tag
+    _root_close = closing_tag(root_tag)
+    _seo_mapping = seo_mapping_for(seo_plugins)
+
+
+def parse_fragment(fragment: bytes, root_tag: bytes | None = None) -> ET.Element:
+    """Parse one item fragment inside the root tag given, or the worker's own."""
+    if root_tag is None:
+        document = _root_open + fragment + _root_close
+    else:
+        document = root_tag + fragment + closing_tag(root_tag)
+    return ET.fromstring(document.decode("utf-8", errors="ignore"))[0]
+
+
+def build_batch(fragments: list[bytes]) -> list[ItemResult | None]:
+    """Convert a batch of item fragments; runs inside a worker process."""
+    results: list[ItemResult | None] = []
+    for fragment in fragments:
+        item = parse_fragment(fragment)
+        fields = ChildFields(item)
+        post_type = fields("wp:post_type")
+        if post_type == "attachment":
+            results.append((post_type, fields("wp:post_id"), fields("wp:attachment_url")))
+        elif post_type == "post":
+            post, thumbnail_id = build_post(item, fields, _seo_mapping)
+            results.append((post_type, post, thumbnail_id))
+        else:
+            results.append(None)
+    return results
+
+
+def batched(fragments: Iterable[bytes], size: int) -> Iterator[list[bytes]]:
+    batch: list[bytes] = []
+    for fragment in fragments:
+        batch.append(fragment)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _resolve(resolver: FeaturedImageResolver, results: list[ItemResult | None]) -> Iterator[dict[str, object]]:
+    for result in results:
+        if result is None:
+            continue
+        post_type, payload, reference = result
+        if post_type == "attachment":
+            yield from resolver.add_attachment(payload, reference)
+        else:
+            yield from resolver.add_record(payload, reference)
+
+
+def iter_posts_parallel(
+    path: Path, workers: int, batch_size: int = 64, seo_mapping: SeoMapping = SEO_MAPPING
+) -> Iterator[dict[str, object]]:
+    """Yield posts in export order, building them on `workers` processes."""
+    resolver = FeaturedImageResolver()
+    in_flight: deque[Future[list[ItemResult | None]]] = deque()
+    max_in_flight = workers * 4
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(read_root_tag(path), seo_mapping.plugins),
+    ) as pool:
+        for batch in batched(iter_item_fragments(path), batch_size):
+            in_flight.append(pool.submit(build_batch, batch))
+            if len(in_flight) >= max_in_flight:
+                yield from _resolve(resolver, in_flight.popleft().result())
+        while in_flight:
+            yield from _resolve(resolver, in_flight.popleft().result())
+
+    yield from resolver.finish()
@@ -0,0 +1,248 @@
+"""Build posts.json records from WXR `<item>` elements."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from collections import deque
+from collections.abc import Container, Iterable, Iterator
+from pathlib import Path
+from typing import IO
+import xml.etree.ElementTree as ET
+
+from .language import detect_language
+from .reader import ChildFields, iter_items, qualify, text_or_empty
+from .rewrite import UrlRewriter
+from .seo import SEO_MAPPING, SeoMapping, build_seo
+
+POST_META_KEYS = SEO_MAPPING.meta_keys
+
+POSTMETA_TAG = qualify("wp:postmeta")
+META_KEY_TAG = qualify("wp:meta_key")
+META_VALUE_TAG = qualify("wp:meta_value")
+
+# Records held back for a forward thumbnail reference before they go to disk.
+DEFAULT_MAX_HELD = 1000
+
+
+class FeaturedImageResolver:
+    """Resolve `_thumbnail_id` references to attachment URLs in a single pass.
+
+    Records are released in their original order. A record whose thumbnail
+    attachment has not streamed by yet is held back, together with the records
+    after it, until the attachment shows up or the export ends. Once more than
+    `max_held` records are held back, they and every later record are spilled
+    to a temporary JSON Lines file and released by `finish`, so a thumbnail
+    that never resolves costs disk rather than memory.
+
+    If an attachment id occurs twice, its first URL is kept and the later one
+    ignored: records may already have been released with the first. (The
+    two-pass extraction this replaced let the last one win.)
+    """
+
+    def __init__(self, field: str = "featured_image", max_held: int = DEFAULT_MAX_HELD) -> None:
+        self.field = field
+        self.max_held = max_held
+        self.attachments: dict[str, str] = {}
+        self._pending: dict[str, list[dict[str, object]]] = {}
+        self._unresolved: set[int] = set()
+        self._queue: deque[dict[str, object]] = deque()
+        self._spill: IO[str] | None = None
+        self._spilled_pending: set[str] = set()
+        self._late: dict[str, str] = {}
+
+    def add_attachment(self, attachment_id: str, url: str) -> list[dict[str, object]]:
+        if not attachment_id or not url or attachment_id in self.attachments:
+            return []
+        self.attachments[attachment_id] = url
+        if attachment_id in self._spilled_pending:
+            self._spilled_pending.discard(attachment_id)
+            self._late[attachment_id] = url
+        waiting = self._pending.pop(attachment_id, None)
+        if not waiting:
+            return []
+        for record in waiting:
+            record[self.field] = url
+            self._unresolved.discard(id(record))
+        return self._release()
+
+    def add_record(self, record: dict[str, object], thumbnail_id: str) -> list[dict[str, object]]:
+        # "0", blanks and other non-ids mean "no thumbnail"; never wait for them.
+        if not thumbnail_id.isdigit() or int(thumbnail_id) == 0:
+            thumbnail_id = ""
+        url = self.attachments.get(thumbnail_id) if thumbnail_id else None
+        if url is not None:
+            record[self.field] = url
+        if self._spill is not None:
+            self._write_spilled(record, thumbnail_id if url is None else "")
+            return []
+        if url is None and thumbnail_id:
+            self._pending.setdefault(thumbnail_id, []).append(record)
+            self._unresolved.add(id(record))
+        self._queue.append(record)
+        released = self._release()
+        if len(self._queue) > self.max_held:
+            self._start_spill()
+        return released
+
+    def add_item(self, item: ET.Element, fields: ChildFields | None = None) -> list[dict[str, object]]:
+        """Record the item if it is an attachment; other items are ignored."""
+        field = fields or ChildFields(item)
+        if field("wp:post_type") != "attachment":
+            return []
+        return self.add_attachment(field("wp:post_id"), field("wp:attachment_url"))
+
+    def finish(self) -> Iterator[dict[str, object]]:
+        """Release everything still held back; unmatched thumbnails stay empty."""
+        self._pending.clear()
+        self._unresolved.clear()
+        yield from self._release()
+        if self._spill is None:
+            return
+        spill, self._spill = self._spill, None
+        with spill:
+            spill.seek(0)
+            for line in spill:
+                thumbnail_id, record = json.loads(line)
+                url = self._late.get(thumbnail_id) if thumbnail_id else None
+                if url is not None:
+                    record[self.field] = url
+                yield record
+        self._spilled_pending.clear()
+        self._late.clear()
+
+    def _release(self) -> list[dict[str, object]]:
+        released: list[dict[str, object]] = []
+        while self._queue and id(self._queue[0]) not in self._unresolved:
+            released.append(self._queue.popleft())
+        return released
+
+    def _start_spill(self) -> None:
+        self._spill = tempfile.TemporaryFile("w+", encoding="utf-8")
+        waiting_for = {
+            id(record): thumbnail_id for thumbnail_id, records in self._pending.items() for record in records
+        }
+        for record in self._queue:
+            self._write_spilled(record, waiting_for.get(id(record), ""))
+        self._queue.clear()
+        self._pending.clear()
+        self._unresolved.clear()
+
+    def _write_spilled(self, record: dict[str, object], thumbnail_id: str) -> None:
+        if thumbnail_id:
+            self._spilled_pending.add(thumbnail_id)
+        self._spill.write(json.dumps([thumbnail_id, record], ensure_ascii=False))
+        self._spill.write("\n")
+
+
+def extract_categories(item: ET.Element) -> tuple[list[str], list[str]]:
+    categories: list[str] = []
+    tags: list[str] = []
+    for category in item.findall("category"):
+        domain = category.get("domain", "")
+        name = text_or_empty(category.text).strip()
+        if not name:
+            continue
+        if domain == "category":
+            categories.append(name)
+        elif domain == "post_tag":
+            tags.append(name)
+    return categories, tags
+
+
+def extract_meta(item: ET.Element, keys: Container[str] | None = None) -> dict[str, str]:
+    """Collect postmeta, keeping only `keys` when given so junk is never decoded."""
+    meta: dict[str, str] = {}
+    for meta_node in item:
+        if meta_node.tag != POSTMETA_TAG:
+            continue
+        key = value = None
+        for child in meta_node:
+            if child.tag == META_KEY_TAG:
+                if key is None:
+                    key = child.text or ""
+            elif child.tag == META_VALUE_TAG and value is None:
+                value = child.text or ""
+        if not key or (keys is not None and key not in keys):
+            continue
+        if value is not None:
+            meta[key] = value
+    return meta
+
+
+def build_post(
+    item: ET.Element, fields: ChildFields | None = None, seo_mapping: SeoMapping = SEO_MAPPING
+) -> tuple[dict[str, object], str]:
+    """Return the post record for a `post` item and its `_thumbnail_id`."""
+    field = fields or ChildFields(item)
+    wordpress_id = field("wp:post_id")
+    slug = field("wp:post_name")
+    title = field("title")
+    excerpt = field("excerpt:encoded")
+    content = field("content:encoded")
+    author = field("dc:creator")
+    status = field("wp:status") or "publish"
+    published_at = field("wp:post_date") or field("pubDate")
+
+    categories, tags = extract_categories(item)
+    meta = extract_meta(item, seo_mapping.meta_keys)
+    seo = build_seo(meta, seo_mapping)
+    thumbnail_id = meta.get("_thumbnail_id", "")
+    language = detect_language(categories, tags, slug, title)
+
+    post: dict[str, object] = {
+        "id": int(wordpress_id) if wordpress_id.isdigit() else wordpress_id,
+        "title": title,
+        "slug": slug,
+        "content": content,
+        "excerpt": excerpt,
+        "author": author,
+        "date": published_at,
+        "status": status,
+        "categories": categories,
+        "tags": tags,
+        "featured_image": "",
+        "language": language,
+    }
+
+    if seo:
+        post["seo"] = seo
+
+    return post, thumbnail_id
+
+
+def _iter_resolved_posts(items: Iterable[ET.Element], seo_mapping: SeoMapping) -> Iterator[dict[str, object]]:
+    resolver = FeaturedImageResolver()
+
+    for item in items:
+        fields = ChildFields(item)
+        post_type = fields("wp:post_type")
+        if post_type == "attachment":
+            yield from resolver.add_item(item, fields)
+        elif post_type == "post":
+            yield from resolver.add_record(*build_post(item, fields, seo_mapping))
+
+    yield from resolver.finish()
+
+
+def iter_posts(
+    items: Iterable[ET.Element],
+    rewriter: UrlRewriter | None = None,
+    seo_mapping: SeoMapping = SEO_MAPPING,
+) -> Iterator[dict[str, object]]:
+    """Yield post records in export order, rewriting migrated URLs when given a rewriter."""
+    posts = _iter_resolved_posts(items, seo_mapping)
+    # The rewrite runs after the featured image is resolved so it covers that field too.
+    return rewriter.rewrite_posts(posts) if rewriter else posts
+
+
+def extract_posts(
+    channel: ET.Element, rewriter: UrlRewriter | None = None, seo_mapping: SeoMapping = SEO_MAPPING
+) -> list[dict[str, object]]:
+    return list(iter_posts(channel.findall("item"), rewriter, seo_mapping))
+
+
+def extract_posts_streaming(
+    path: Path, rewriter: UrlRewriter | None = None, seo_mapping: SeoMapping = SEO_MAPPING
+) -> list[dict[str, object]]:
+    return list(iter_posts(iter_items(path), rewriter, seo_mapping))
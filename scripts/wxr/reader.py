@@ -0,0 +1,134 @@
+"""Load and stream WordPress WXR export files."""
+
+from __future__ import annotations
+
+import io
+from collections.abc import Iterator
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+NAMESPACES = {
+    "content": "http://purl.org/rss/1.0/modules/content/",
+    "excerpt": "http://purl.org/rss/1.0/modules/excerpt/",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "wp": "http://wordpress.org/export/1.2/",
+}
+
+for prefix, uri in NAMESPACES.items():
+    ET.register_namespace(prefix, uri)
+
+
+def text_or_empty(value: str | None) -> str:
+    return value if value is not None else ""
+
+
+def get_child_text(item: ET.Element, tag: str) -> str:
+    return text_or_empty(item.findtext(tag, namespaces=NAMESPACES))
+
+
+def qualify(tag: str) -> str:
+    """Expand a prefixed tag such as `wp:post_id` to ElementTree's `{uri}post_id` form."""
+    prefix, separator, local = tag.partition(":")
+    if not separator:
+        return tag
+    return f"{{{NAMESPACES[prefix]}}}{local}"
+
+
+class QualifiedNames(dict[str, str]):
+    """Prefixed tag -> qualified tag, each expanded once on first use."""
+
+    def __missing__(self, tag: str) -> str:
+        qualified = self[tag] = qualify(tag)
+        return qualified
+
+
+QUALIFIED_NAMES = QualifiedNames()
+
+
+class ChildFields:
+    """The texts of an element's direct children, indexed by tag in one scan.
+
+    Call it with the prefixed tags `get_child_text` takes. Like `findtext`,
+    the first child with a tag wins and a missing child reads as "", but
+    every lookup after the scan is a single dict probe instead of an
+    ElementPath search.
+    """
+
+    __slots__ = ("texts",)
+
+    def __init__(self, element: ET.Element) -> None:
+        # Reversed so that the first of several same-tag children wins.
+        self.texts = {child.tag: child.text for child in reversed(element)}
+
+    def __call__(self, tag: str) -> str:
+        text = self.texts.get(QUALIFIED_NAMES[tag])
+        return text if text is not None else ""
+
+
+def load_xml(path: Path) -> ET.Element:
+    raw = path.read_text(encoding="utf-8", errors="ignore")
+    start_index = raw.find("<?xml")
+    if start_index == -1:
+        raise ValueError("XML declaration not found in export file")
+    trimmed = raw[start_index:]
+    return ET.fromstring(trimmed)
+
+
+def get_channel(root: ET.Element) -> ET.Element:
+    channel = root.find("channel")
+    if channel is None:
+        raise ValueError("Invalid WordPress export: missing channel")
+    return channel
+
+
+def find_xml_start(handle: io.BufferedIOBase, chunk_size: int = 1 << 16) -> int:
+    """Return the byte offset of the XML declaration without reading the whole file."""
+    marker = b"<?xml"
+    offset = 0
+    tail = b""
+    while True:
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            raise ValueError("XML declaration not found in export file")
+        window = tail + chunk
+        index = window.find(marker)
+        if index != -1:
+            return offset - len(tail) + index
+        tail = window[-(len(marker) - 1) :]
+        offset += len(chunk)
+
+
+def iter_channel(path: Path) -> Iterator[ET.Element]:
+    """Stream the direct children of `<channel>` one at a time.
+
+    Each element is detached from the channel once the caller is done with it,
+    so memory stays bounded by the largest single element rather than the
+    export.
+    """
+    with path.open("rb") as raw:
+        raw.seek(find_xml_start(raw))
+        handle = io.TextIOWrapper(raw, encoding="utf-8", errors="ignore")
+        depth = 0
+        channel: ET.Element | None = None
+        for event, element in ET.iterparse(handle, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 2 and element.tag == "channel":
+                    channel = element
+                continue
+
+            depth -= 1
+            if depth != 2 or channel is None:
+                continue
+            yield element
+            element.clear()
+            channel.remove(element)
+        if channel is None:
+            raise ValueError("Invalid WordPress export: missing channel")
+
+
+def iter_items(path: Path) -> Iterator[ET.Element]:
+    """Stream `<item>` elements from the export one at a time."""
+    for element in iter_channel(path):
+        if element.tag == "item":
+            yield element
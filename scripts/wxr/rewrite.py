@@ -0,0 +1,106 @@
+"""Rewrite migrated media URLs in post records in one scan per field.
+
+image-migration-mappings.json maps old WordPress URLs to their new storage
+URLs. As in update-content-with-supabase-urls.ts, a mapping matches case
+insensitively and regardless of http/https or a leading `www.`. All
+mappings are compiled into a single regex whose alternation is factored
+into a character trie. Each position of the text is then matched by
+walking one trie path, so the cost of a scan does not grow with the number
+of mappings. Where several mappings match at the same place, the longest
+one wins.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+
+SCHEME_PREFIX = re.compile(r"^https?://(?:www\.)?", re.IGNORECASE)
+SEO_IMAGE_FIELDS = ("og_image", "twitter_image")
+
+Trie = dict[str, "Trie"]
+
+
+def _normalize(url: str) -> str:
+    return SCHEME_PREFIX.sub("", url).lower()
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Return a regex matching any of `words`, with shared prefixes factored out."""
+    root: Trie = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Trie) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            # A word ends here but longer ones continue; try the longer ones first.
+            return f"(?:{pattern})?"
+        return pattern
+
+    return build(root)
+
+
+class UrlRewriter:
+    """Replace every mapped URL in post content, featured image and SEO images."""
+
+    def __init__(self, mappings: Mapping[str, str]) -> None:
+        self.targets = {_normalize(old): new for old, new in mappings.items() if _normalize(old)}
+        self.replacements = 0
+        self.posts_changed = 0
+        self.pattern = (
+            re.compile(rf"https?://(?:www\.)?({_trie_pattern(self.targets)})", re.IGNORECASE)
+            if self.targets
+            else None
+        )
+
+    def fingerprint(self) -> str:
+        """Hash of the effective mappings, to tell whether output was rewritten the same way."""
+        encoded = json.dumps(sorted(self.targets.items()), ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _replace(self, match: re.Match[str]) -> str:
+        return self.targets[match.group(1).lower()]
+
+    def rewrite(self, text: str) -> tuple[str, int]:
+        """Return `text` with mapped URLs replaced and the number of replacements."""
+        if self.pattern is None or not text:
+            return text, 0
+        return self.pattern.subn(self._replace, text)
+
+    def rewrite_post(self, post: dict[str, object]) -> dict[str, object]:
+        """Rewrite `post` in place and return it."""
+        count = 0
+        for field in ("content", "featured_image"):
+            value = post.get(field)
+            if isinstance(value, str):
+                post[field], replaced = self.rewrite(value)
+                count += replaced
+        seo = post.get("seo")
+        if isinstance(seo, dict):
+            for field in SEO_IMAGE_FIELDS:
+                value = seo.get(field)
+                if isinstance(value, str):
+                    seo[field], replaced = self.rewrite(value)
+                    count += replaced
+        if count:
+            self.replacements += count
+            self.posts_changed += 1
+        return post
+
+    def rewrite_posts(self, posts: Iterable[dict[str, object]]) -> Iterator[dict[str, object]]:
+        for post in posts:
+            yield self.rewrite_post(post)
+
+
+def load_rewriter(path: Path) -> UrlRewriter:
+    return UrlRewriter(json.loads(path.read_text(encoding="utf-8")))
@@ -0,0 +1,160 @@
+"""Declarative postmeta -> SEO field mapping for Yoast, Rank Math and AIOSEO.
+
+Each plugin contributes a table of `(meta_key, seo_field, parser)` rows.
+`SeoMapping` compiles the tables once into a single lookup. Postmeta can then
+be filtered to the wanted keys while it is read, and each post's SEO block is
+built from the few keys that survive. When several plugins fill the same
+field, the table passed first wins.
+
+Only Yoast, which the site runs, is read by default. Rank Math and AIOSEO
+meta left behind by plugins tried in the past would otherwise fill fields
+Yoast leaves empty, so those tables are opt-in through `seo_mapping_for`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Callable, Iterable, Mapping
+
+MetaParser = Callable[[str], object]
+SeoRow = tuple[str, str, MetaParser | None]
+
+EMPTY_VALUES = ("", None, [], {})
+
+
+def parse_json_meta(value: str) -> object:
+    value = value.strip()
+    if not value:
+        return ""
+    if value.startswith("{") or value.startswith("["):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return value
+
+
+YOAST_SEO_FIELDS: tuple[SeoRow, ...] = (
+    ("_yoast_wpseo_title", "title", None),
+    ("_yoast_wpseo_metadesc", "description", None),
+    ("_yoast_wpseo_focuskw", "focus_keyword", None),
+    ("_yoast_wpseo_focuskeywords", "focus_keywords", parse_json_meta),
+    ("_yoast_wpseo_keywordsynonyms", "keyword_synonyms", parse_json_meta),
+    ("_yoast_wpseo_content_score", "content_score", None),
+    ("_yoast_wpseo_linkdex", "linkdex", None),
+    ("_yoast_wpseo_estimated-reading-time-minutes", "estimated_reading_time_minutes", None),
+    ("_yoast_wpseo_opengraph-title", "og_title", None),
+    ("_yoast_wpseo_opengraph-description", "og_description", None),
+    ("_yoast_wpseo_opengraph-image", "og_image", None),
+    ("_yoast_wpseo_opengraph-image-id", "og_image_id", None),
+    ("_yoast_wpseo_twitter-title", "twitter_title", None),
+    ("_yoast_wpseo_twitter-description", "twitter_description", None),
+    ("_yoast_wpseo_twitter-image", "twitter_image", None),
+    ("_yoast_wpseo_twitter-image-id", "twitter_image_id", None),
+    ("_yoast_wpseo_canonical", "canonical", None),
+    ("_yoast_wpseo_redirect", "redirect", None),
+    ("_yoast_wpseo_meta-robots", "meta_robots", None),
+    ("_yoast_wpseo_meta-robots-noindex", "meta_robots_noindex", None),
+    ("_yoast_wpseo_meta-robots-nofollow", "meta_robots_nofollow", None),
+    ("_yoast_wpseo_meta-robots-adv", "meta_robots_adv", None),
+)
+
+RANK_MATH_SEO_FIELDS: tuple[SeoRow, ...] = (
+    ("rank_math_title", "title", None),
+    ("rank_math_description", "description", None),
+    ("rank_math_focus_keyword", "focus_keyword", None),
+    ("rank_math_seo_score", "content_score", None),
+    ("rank_math_facebook_title", "og_title", None),
+    ("rank_math_facebook_description", "og_description", None),
+    ("rank_math_facebook_image", "og_image", None),
+    ("rank_math_facebook_image_id", "og_image_id", None),
+    ("rank_math_twitter_title", "twitter_title", None),
+    ("rank_math_twitter_description", "twitter_description", None),
+    ("rank_math_twitter_image", "twitter_image", None),
+    ("rank_math_twitter_image_id", "twitter_image_id", None),
+    ("rank_math_canonical_url", "canonical", None),
+    ("rank_math_robots", "meta_robots", None),
+    ("rank_math_advanced_robots", "meta_robots_adv", None),
+)
+
+AIOSEO_SEO_FIELDS: tuple[SeoRow, ...] = (
+    ("_aioseo_title", "title", None),
+    ("_aioseo_description", "description", None),
+    ("_aioseo_keywords", "focus_keywords", parse_json_meta),
+    ("_aioseo_og_title", "og_title", None),
+    ("_aioseo_og_description", "og_description", None),
+    ("_aioseo_twitter_title", "twitter_title", None),
+    ("_aioseo_twitter_description", "twitter_description", None),
+    ("_aioseop_title", "title", None),
+    ("_aioseop_description", "description", None),
+    ("_aioseop_keywords", "focus_keyword", None),
+)
+
+
+class SeoMapping:
+    """Compiled lookup from postmeta key to (field position, priority, parser)."""
+
+    def __init__(self, *tables: Iterable[SeoRow], plugins: tuple[str, ...] = ()) -> None:
+        self.plugins = plugins
+        self.fields: list[str] = []
+        self.keys: dict[str, tuple[int, int, MetaParser | None]] = {}
+        positions: dict[str, int] = {}
+        for priority, table in enumerate(tables):
+            for meta_key, field, parser in table:
+                if field not in positions:
+                    positions[field] = len(self.fields)
+                    self.fields.append(field)
+                self.keys.setdefault(meta_key, (positions[field], priority, parser))
+        self.wanted = frozenset(self.keys)
+        # What a post reads from its postmeta: the SEO keys plus its thumbnail.
+        self.meta_keys = self.wanted | {"_thumbnail_id"}
+
+    def build(self, meta: Mapping[str, str]) -> dict[str, object]:
+        found: dict[int, tuple[int, object]] = {}
+        for key, raw in meta.items():
+            spec = self.keys.get(key)
+            if spec is None:
+                continue
+            position, priority, parser = spec
+            value = parser(raw) if parser is not None else raw
+            if value in EMPTY_VALUES:
+                continue
+            current = found.get(position)
+            if current is None or priority < current[0]:
+                found[position] = (priority, value)
+        return {self.fields[position]: found[position][1] for position in sorted(found)}
+
+
+SEO_PLUGIN_TABLES: dict[str, tuple[SeoRow, ...]] = {
+    "yoast": YOAST_SEO_FIELDS,
+    "rank_math": RANK_MATH_SEO_FIELDS,
+    "aioseo": AIOSEO_SEO_FIELDS,
+}
+DEFAULT_SEO_PLUGINS = ("yoast",)
+
+
+def seo_mapping_for(plugins: Iterable[str]) -> SeoMapping:
+    """Compile the tables of `plugins`; a plugin listed earlier wins shared fields."""
+    plugins = tuple(plugins)
+    unknown = [plugin for plugin in plugins if plugin not in SEO_PLUGIN_TABLES]
+    if unknown:
+        raise ValueError(
+            f"Unknown SEO plugin: {', '.join(unknown)} (choose from {', '.join(SEO_PLUGIN_TABLES)})"
+        )
+    return SeoMapping(*(SEO_PLUGIN_TABLES[plugin] for plugin in plugins), plugins=plugins)
+
+
+SEO_MAPPING = seo_mapping_for(DEFAULT_SEO_PLUGINS)
+
+
+def seo_plugins_arg(value: str) -> SeoMapping:
+    """argparse `type` for a comma-separated --seo-plugins value."""
+    try:
+        return seo_mapping_for(name.strip() for name in value.split(",") if name.strip())
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from error
+
+
+def build_seo(meta: Mapping[str, str], mapping: SeoMapping = SEO_MAPPING) -> dict[str, object]:
+    return mapping.build(meta)
@@ -0,0 +1,158 @@
+"""Write posts as a slim listing manifest plus paginated shards.
+
+Layout under the output directory:
+
+    manifest.json            totals, page size and every shard path
+    pages/0001.json          listing entries for all posts, `page_size` per file
+    <language>/0001.json     the same, per language
+    content/<id>.json        content, excerpt and seo of one post
+
+Listing entries carry `LISTING_FIELDS` only, so a listing or pagination
+consumer reads one small page instead of the whole posts.json. A listing
+entry merged with its content file is the full posts.json record. Pages
+keep export order, matching posts.json.
+
+Each run replaces the whole directory, so it must be missing, empty or a
+previous run's shards (recognized by their manifest.json); anything else,
+such as the content directory itself, is refused.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_PAGE_SIZE = 100
+LISTING_FIELDS = (
+    "id",
+    "slug",
+    "title",
+    "date",
+    "author",
+    "status",
+    "categories",
+    "tags",
+    "featured_image",
+    "language",
+)
+ALL_POSTS = "pages"
+MANIFEST_NAME = "manifest.json"
+
+
+def _dump(path: Path, value: object) -> None:
+    path.write_text(json.dumps(value, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+class ShardWriter:
+    """Split records into listing pages and per-id content files as they arrive.
+
+    Only the pages currently being filled are held in memory. Like
+    `RecordWriter`, it can be fed through a `TeeWriter`.
+    """
+
+    def __init__(self, output_dir: Path, page_size: int = DEFAULT_PAGE_SIZE) -> None:
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.output_dir = output_dir
+        self.page_size = page_size
+        self.count = 0
+        self._open_pages: dict[str, list[dict[str, object]]] = {}
+        self._pages: dict[str, list[str]] = {}
+        self._counts: dict[str, int] = {}
+        (output_dir / "content").mkdir(parents=True, exist_ok=True)
+
+    def write(self, record: dict[str, object]) -> None:
+        listing = {field: record[field] for field in LISTING_FIELDS if field in record}
+        details = {key: value for key, value in record.items() if key not in LISTING_FIELDS}
+        _dump(self.output_dir / "content" / f"{record['id']}.json", {"id": record["id"], **details})
+
+        self._add(ALL_POSTS, listing)
+        language = record.get("language")
+        if language:
+            self._add(str(language), listing)
+        self.count += 1
+
+    def _add(self, shard: str, listing: dict[str, object]) -> None:
+        page = self._open_pages.setdefault(shard, [])
+        page.append(listing)
+        self._counts[shard] = self._counts.get(shard, 0) + 1
+        if len(page) >= self.page_size:
+            self._flush(shard)
+
+    def _flush(self, shard: str) -> None:
+        page = self._open_pages.pop(shard, None)
+        if not page:
+            return
+        pages = self._pages.setdefault(shard, [])
+        relative = f"{shard}/{len(pages) + 1:04d}.json"
+        (self.output_dir / shard).mkdir(exist_ok=True)
+        _dump(self.output_dir / relative, page)
+        pages.append(relative)
+
+    def close(self) -> None:
+        for shard in list(self._open_pages):
+            self._flush(shard)
+        manifest = {
+            "total": self.count,
+            "page_size": self.page_size,
+            "listing_fields": list(LISTING_FIELDS),
+            "content": "content/{id}.json",
+            "pages": self._pages.get(ALL_POSTS, []),
+            "languages": {
+                language: {"total": self._counts[language], "pages": pages}
+                for language, pages in sorted(self._pages.items())
+                if language != ALL_POSTS
+            },
+        }
+        (self.output_dir / MANIFEST_NAME).write_text(
+            json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+
+def _holds_shards(path: Path) -> bool:
+    try:
+        manifest = json.loads((path / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return isinstance(manifest, dict) and "listing_fields" in manifest
+
+
+def check_shards_dir(output_dir: Path) -> None:
+    """Raise ValueError unless `output_dir` is safe for `open_shards` to replace."""
+    if not output_dir.exists():
+        return
+    if not output_dir.is_dir():
+        raise ValueError(f"{output_dir} is not a directory")
+    if any(output_dir.iterdir()) and not _holds_shards(output_dir):
+        raise ValueError(f"{output_dir} is not empty and holds no shards from a previous run; refusing to replace it")
+
+
+@contextmanager
+def open_shards(output_dir: Path, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[ShardWriter]:
+    """Build the shards next to `output_dir` and swap them in once complete.
+
+    Shards from a previous run are replaced as a whole, so no stale page or
+    content file survives, and a failed run leaves the old output untouched.
+    Any other non-empty directory is refused (see `check_shards_dir`).
+    """
+    check_shards_dir(output_dir)
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{output_dir.name}-", dir=output_dir.parent))
+    staging.chmod(0o755)
+    try:
+        writer = ShardWriter(staging, page_size)
+        yield writer
+        writer.close()
+        if output_dir.exists():
+            retired = staging.with_name(f"{staging.name}-old")
+            output_dir.rename(retired)
+            staging.rename(output_dir)
+            shutil.rmtree(retired)
+        else:
+            staging.rename(output_dir)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
@@ -0,0 +1,233 @@
+"""Load extracted posts and comments into an indexed SQLite database.
+
+Downstream tools can look posts up by slug, WordPress id, category, tag,
+language or date, and search titles and content through FTS5, without
+reparsing posts.json:
+
+    SELECT record FROM posts WHERE slug = ?
+    SELECT p.slug FROM posts p JOIN post_terms t ON t.post_seq = p.seq
+        WHERE t.taxonomy = 'category' AND t.name = ? ORDER BY p.date
+    SELECT slug FROM posts WHERE language = 'es' AND date >= '2020-01-01'
+    SELECT p.slug FROM posts_fts JOIN posts p ON p.seq = posts_fts.rowid
+        WHERE posts_fts MATCH 'implant' ORDER BY rank
+
+`record` holds each record exactly as it appears in the JSON output, and
+`seq` keeps export order. Every load replaces only its own tables, so posts
+and comments can be written by separate runs into the same file.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .writer import TeeWriter, open_writer, write_records
+
+INSERT_BATCH_SIZE = 500
+
+SCHEMAS: dict[str, tuple[str, ...]] = {
+    "posts": (
+        """
+        CREATE TABLE posts (
+            seq INTEGER PRIMARY KEY,
+            wordpress_id,
+            slug TEXT,
+            title TEXT,
+            content TEXT,
+            excerpt TEXT,
+            author TEXT,
+            date TEXT,
+            status TEXT,
+            featured_image TEXT,
+            language TEXT,
+            record TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE post_terms (
+            post_seq INTEGER NOT NULL REFERENCES posts (seq),
+            taxonomy TEXT NOT NULL,
+            name TEXT NOT NULL
+        )
+        """,
+    ),
+    "comments": (
+        """
+        CREATE TABLE comments (
+            seq INTEGER PRIMARY KEY,
+            legacy_comment_id,
+            wordpress_post_id,
+            post_slug TEXT,
+            parent_legacy_id,
+            author_name TEXT,
+            author_email TEXT,
+            status TEXT,
+            created_at TEXT,
+            record TEXT NOT NULL
+        )
+        """,
+    ),
+}
+
+# Built after the bulk load, which is much cheaper than maintaining them per row.
+INDEXES: dict[str, tuple[str, ...]] = {
+    "posts": (
+        "CREATE INDEX idx_posts_slug ON posts (slug)",
+        "CREATE INDEX idx_posts_wordpress_id ON posts (wordpress_id)",
+        "CREATE INDEX idx_posts_language_date ON posts (language, date)",
+        "CREATE INDEX idx_posts_date ON posts (date)",
+        "CREATE INDEX idx_post_terms_name ON post_terms (taxonomy, name, post_seq)",
+        "CREATE INDEX idx_post_terms_post ON post_terms (post_seq)",
+    ),
+    "comments": (
+        "CREATE INDEX idx_comments_post ON comments (wordpress_post_id)",
+        "CREATE INDEX idx_comments_post_slug ON comments (post_slug)",
+        "CREATE INDEX idx_comments_legacy_id ON comments (legacy_comment_id)",
+        "CREATE INDEX idx_comments_created_at ON comments (created_at)",
+    ),
+}
+
+TABLES: dict[str, tuple[str, ...]] = {
+    "posts": ("posts_fts", "post_terms", "posts"),
+    "comments": ("comments",),
+}
+
+POSTS_FTS = (
+    "CREATE VIRTUAL TABLE posts_fts USING fts5("
+    "title, content, content='posts', content_rowid='seq', tokenize='unicode61 remove_diacritics 2')"
+)
+
+
+def _encode(record: dict[str, object]) -> str:
+    return json.dumps(record, ensure_ascii=False)
+
+
+class StoreWriter:
+    """Insert records of one kind in batches; a drop-in for `RecordWriter`.
+
+    On SQLite builds without FTS5, posts get every other index and
+    `full_text_error` holds the reason the full-text index was skipped.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, kind: str) -> None:
+        if kind not in SCHEMAS:
+            raise ValueError(f"Unknown record kind: {kind} (choose from {', '.join(SCHEMAS)})")
+        self.connection = connection
+        self.kind = kind
+        self.count = 0
+        self.full_text_error: str | None = None
+        self._rows: list[tuple[object, ...]] = []
+        self._terms: list[tuple[int, str, str]] = []
+
+        for table in TABLES[kind]:
+            connection.execute(f"DROP TABLE IF EXISTS {table}")
+        for statement in SCHEMAS[kind]:
+            connection.execute(statement)
+
+    def write(self, record: dict[str, object]) -> None:
+        self.count += 1
+        if self.kind == "posts":
+            self._rows.append(
+                (
+                    self.count,
+                    record.get("id"),
+                    record.get("slug"),
+                    record.get("title"),
+                    record.get("content"),
+                    record.get("excerpt"),
+                    record.get("author"),
+                    record.get("date"),
+                    record.get("status"),
+                    record.get("featured_image"),
+                    record.get("language"),
+                    _encode(record),
+                )
+            )
+            for taxonomy, key in (("category", "categories"), ("tag", "tags")):
+                self._terms.extend((self.count, taxonomy, name) for name in record.get(key) or ())
+        else:
+            self._rows.append(
+                (
+                    self.count,
+                    record.get("legacy_comment_id"),
+                    record.get("wordpress_post_id"),
+                    record.get("post_slug"),
+                    record.get("parent_legacy_id"),
+                    record.get("author_name"),
+                    record.get("author_email"),
+                    record.get("status"),
+                    record.get("created_at"),
+                    _encode(record),
+                )
+            )
+        if len(self._rows) >= INSERT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._rows:
+            placeholders = ", ".join("?" * len(self._rows[0]))
+            self.connection.executemany(f"INSERT INTO {self.kind} VALUES ({placeholders})", self._rows)
+            self._rows.clear()
+        if self._terms:
+            self.connection.executemany("INSERT INTO post_terms VALUES (?, ?, ?)", self._terms)
+            self._terms.clear()
+
+    def close(self) -> None:
+        self.flush()
+        for statement in INDEXES[self.kind]:
+            self.connection.execute(statement)
+        if self.kind == "posts":
+            try:
+                self.connection.execute(POSTS_FTS)
+            except sqlite3.OperationalError as error:
+                self.full_text_error = str(error)
+            else:
+                self.connection.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.execute("PRAGMA synchronous = NORMAL")
+    return connection
+
+
+@contextmanager
+def open_store(path: Path, kinds: tuple[str, ...] = ("posts", "comments")) -> Iterator[dict[str, StoreWriter]]:
+    """Yield a writer per record kind, loading them all in one transaction.
+
+    The tables of `kinds` are replaced; other tables in the file are kept.
+    Nothing is committed if the block raises.
+    """
+    connection = connect(path)
+    try:
+        connection.execute("BEGIN")
+        writers = {kind: StoreWriter(connection, kind) for kind in kinds}
+        try:
+            yield writers
+            for writer in writers.values():
+                writer.close()
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+
+
+def write_and_store(
+    records: Iterable[dict[str, object]],
+    output_path: Path,
+    kind: str,
+    store_path: Path | None = None,
+    jsonl: bool = False,
+) -> int:
+    """`write_records`, also loading the records into `store_path` when given."""
+    if store_path is None:
+        return write_records(records, output_path, jsonl=jsonl)
+    with open_store(store_path, (kind,)) as store, open_writer(output_path, jsonl=jsonl) as writer:
+        return TeeWriter(writer, store[kind]).write_all(records)
@@ -0,0 +1,169 @@
+"""Generate synthetic WordPress exports for benchmarking the WXR converters."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from .reader import NAMESPACES
+from .seo import YOAST_SEO_FIELDS
+
+CATEGORIES = (
+    "Blog English",
+    "Blog español",
+    "Blog português",
+    "Blog in Chinese",
+    "Implantology",
+    "Periodontics",
+    "Periospot Hacks",
+)
+JUNK_META_PREFIXES = ("_elementor_", "_wpb_", "us_", "_oembed_", "patreon-", "hefo_")
+PARAGRAPH = (
+    "<p>Guided bone regeneration around dental implants remains one of the most "
+    "studied procedures in periodontology &amp; implant dentistry.</p>\n"
+)
+
+
+@dataclass(frozen=True)
+class SyntheticExport:
+    items: int
+    comments_per_post: int = 3
+    meta_per_item: int = 20
+    attachment_ratio: float = 0.3
+    paragraphs_per_post: int = 8
+    seed: int = 1
+
+    @property
+    def filename(self) -> str:
+        return (
+            f"wxr-{self.items}i-{self.comments_per_post}c-{self.meta_per_item}m-"
+            f"{self.attachment_ratio:g}a-{self.paragraphs_per_post}p-s{self.seed}.xml"
+        )
+
+
+def cdata(value: str) -> str:
+    return f"<![CDATA[{value}]]>"
+
+
+def write_synthetic_export(path: Path, spec: SyntheticExport) -> Path:
+    """Write a WXR 1.2 export described by `spec`, streaming it item by item.
+
+    Roughly `attachment_ratio` of the items are attachments and the rest are
+    posts. Posts point `_thumbnail_id` at attachments both before and after
+    them, and their comments include replies, so every code path is exercised.
+    """
+    rng = random.Random(spec.seed)
+    attachment_ids = [
+        item_id for item_id in range(1, spec.items + 1) if rng.random() < spec.attachment_ratio
+    ]
+    attachments = set(attachment_ids)
+    namespaces = " ".join(f'xmlns:{prefix}="{uri}"' for prefix, uri in NAMESPACES.items())
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8" ?>\n')
+        out.write(f'<rss version="2.0" {namespaces}>\n<channel>\n')
+        out.write("<title>Periospot</title>\n<link>https://periospot.com</link>\n")
+        out.write("<wp:wxr_version>1.2</wp:wxr_version>\n")
+        out.write(
+            "<wp:author><wp:author_id>1</wp:author_id>"
+            f"<wp:author_login>{cdata('periospot')}</wp:author_login>"
+            f"<wp:author_email>{cdata('team@periospot.com')}</wp:author_email>"
+            f"<wp:author_display_name>{cdata('Periospot')}</wp:author_display_name>"
+            f"<wp:author_first_name>{cdata('Perio')}</wp:author_first_name>"
+            f"<wp:author_last_name>{cdata('Spot')}</wp:author_last_name></wp:author>\n"
+        )
+        for term_id, name in enumerate(CATEGORIES, 1):
+            out.write(
+                f"<wp:category><wp:term_id>{term_id}</wp:term_id>"
+                f"<wp:category_nicename>{cdata(name.lower().replace(' ', '-'))}</wp:category_nicename>"
+                f"<wp:category_parent>{cdata('')}</wp:category_parent>"
+                f"<wp:cat_name>{cdata(name)}</wp:cat_name></wp:category>\n"
+            )
+
+        for item_id in range(1, spec.items + 1):
+            if item_id in attachments:
+                out.write(_attachment(item_id, rng))
+            else:
+                thumbnail_id = rng.choice(attachment_ids) if attachment_ids else 0
+                out.write(_post(item_id, thumbnail_id, spec, rng))
+
+        out.write("</channel>\n</rss>\n")
+    return path
+
+
+def _item_head(item_id: int, title: str, post_type: str, day: int) -> str:
+    return (
+        f"<item>\n<title>{escape(title)}</title>\n"
+        f"<link>https://periospot.com/?p={item_id}</link>\n"
+        "<pubDate>Mon, 02 Mar 2020 10:00:00 +0000</pubDate>\n"
+        f"<dc:creator>{cdata('periospot')}</dc:creator>\n"
+        f"<wp:post_id>{item_id}</wp:post_id>\n"
+        f"<wp:post_date>{cdata(f'2020-03-{day:02d} 10:00:00')}</wp:post_date>\n"
+        f"<wp:post_modified_gmt>{cdata(f'2021-03-{day:02d} 10:00:00')}</wp:post_modified_gmt>\n"
+        f"<wp:post_name>{cdata(f'{post_type}-{item_id}')}</wp:post_name>\n"
+        f"<wp:status>{cdata('publish')}</wp:status>\n"
+        f"<wp:post_parent>0</wp:post_parent>\n"
+        f"<wp:post_type>{cdata(post_type)}</wp:post_type>\n"
+    )
+
+
+def _attachment(item_id: int, rng: random.Random) -> str:
+    url = f"https://periospot.com/wp-content/uploads/2020/03/image-{item_id}.jpg"
+    return (
+        _item_head(item_id, f"image-{item_id}", "attachment", rng.randint(1, 28))
+        + f"<wp:attachment_url>{cdata(url)}</wp:attachment_url>\n"
+        + _postmeta("_wp_attached_file", f"2020/03/image-{item_id}.jpg")
+        + "</item>\n"
+    )
+
+
+def _post(item_id: int, thumbnail_id: int, spec: SyntheticExport, rng: random.Random) -> str:
+    category = rng.choice(CATEGORIES)
+    content = PARAGRAPH * spec.paragraphs_per_post
+    parts = [
+        _item_head(item_id, f"{category}: implant case {item_id}", "post", rng.randint(1, 28)),
+        f"<content:encoded>{cdata(content)}</content:encoded>\n",
+        f"<excerpt:encoded>{cdata('')}</excerpt:encoded>\n",
+        f'<category domain="category" nicename="c">{cdata(category)}</category>\n',
+        f'<category domain="post_tag" nicename="t">{cdata(f"tag-{item_id % 25}")}</category>\n',
+    ]
+
+    meta: list[tuple[str, str]] = [("_thumbnail_id", str(thumbnail_id))]
+    for meta_key, _, parser in YOAST_SEO_FIELDS[: max(0, min(12, spec.meta_per_item - 1))]:
+        value = '[{"keyword": "implant", "score": 60}]' if parser else f"Implant case {item_id}"
+        meta.append((meta_key, value))
+    while len(meta) < spec.meta_per_item:
+        meta.append((f"{rng.choice(JUNK_META_PREFIXES)}{len(meta)}", "x" * rng.randint(10, 200)))
+    parts.extend(_postmeta(key, value) for key, value in meta)
+
+    first_comment_id = item_id * 100
+    for offset in range(spec.comments_per_post):
+        comment_id = first_comment_id + offset
+        parent_id = rng.choice([0, first_comment_id + rng.randrange(offset)]) if offset else 0
+        parts.append(
+            f"<wp:comment><wp:comment_id>{comment_id}</wp:comment_id>"
+            f"<wp:comment_author>{cdata('Reader')}</wp:comment_author>"
+            f"<wp:comment_author_email>{cdata('reader@example.com')}</wp:comment_author_email>"
+            "<wp:comment_author_url></wp:comment_author_url>"
+            f"<wp:comment_author_IP>{cdata('127.0.0.1')}</wp:comment_author_IP>"
+            f"<wp:comment_date>{cdata('2020-03-05 12:00:00')}</wp:comment_date>"
+            f"<wp:comment_date_gmt>{cdata('2020-03-05 12:00:00')}</wp:comment_date_gmt>"
+            f"<wp:comment_content>{cdata(f'Great case, thanks! #{comment_id}')}</wp:comment_content>"
+            f"<wp:comment_approved>{cdata('1')}</wp:comment_approved>"
+            f"<wp:comment_type>{cdata('comment')}</wp:comment_type>"
+            f"<wp:comment_parent>{parent_id}</wp:comment_parent>"
+            "<wp:comment_user_id>0</wp:comment_user_id></wp:comment>\n"
+        )
+
+    parts.append("</item>\n")
+    return "".join(parts)
+
+
+def _postmeta(key: str, value: str) -> str:
+    return (
+        f"<wp:postmeta><wp:meta_key>{cdata(key)}</wp:meta_key>"
+        f"<wp:meta_value>{cdata(value)}</wp:meta_value></wp:postmeta>\n"
+    )
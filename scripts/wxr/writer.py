@@ -0,0 +1,90 @@
+"""Write extracted records incrementally as a JSON array or JSON Lines."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TextIO
+
+
+class RecordWriter:
+    """Emit records one at a time so only the current record is held in memory.
+
+    The array format matches `json.dump(records, indent=2, ensure_ascii=False)`
+    byte for byte. With `jsonl=True` each record is written on its own line.
+    """
+
+    def __init__(self, handle: TextIO, jsonl: bool = False) -> None:
+        self.handle = handle
+        self.jsonl = jsonl
+        self.count = 0
+
+    def write(self, record: object) -> None:
+        if self.jsonl:
+            self.handle.write(json.dumps(record, ensure_ascii=False))
+            self.handle.write("\n")
+        else:
+            encoded = json.dumps(record, ensure_ascii=False, indent=2)
+            self.handle.write("[\n  " if self.count == 0 else ",\n  ")
+            self.handle.write(encoded.replace("\n", "\n  "))
+        self.count += 1
+
+    def write_all(self, records: Iterable[object]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self) -> None:
+        if not self.jsonl:
+            self.handle.write("[]" if self.count == 0 else "\n]")
+
+
+class TeeWriter:
+    """Send every record to several writers; `count` follows the first one."""
+
+    def __init__(self, *writers) -> None:
+        self.writers = writers
+
+    @property
+    def count(self) -> int:
+        return self.writers[0].count
+
+    def write(self, record: object) -> None:
+        for writer in self.writers:
+            writer.write(record)
+
+    def write_all(self, records: Iterable[object]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+
+@contextmanager
+def open_writer(path: Path, jsonl: bool = False) -> Iterator[RecordWriter]:
+    """Write to a sibling file that replaces `path` only once the block succeeds.
+
+    A run that fails mid-extraction leaves the previous output untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f".{path.name}.partial")
+    try:
+        with partial.open("w", encoding="utf-8") as handle:
+            writer = RecordWriter(handle, jsonl=jsonl)
+            yield writer
+            writer.close()
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def output_path_for(path: Path, jsonl: bool) -> Path:
+    """JSON Lines output goes next to the array file with a `.jsonl` suffix."""
+    return path.with_suffix(".jsonl") if jsonl else path
+
+
+def write_records(records: Iterable[object], output_path: Path, jsonl: bool = False) -> int:
+    with open_writer(output_path, jsonl=jsonl) as writer:
+        return writer.write_all(records)
@@ -0,0 +1,27 @@
+-- Make Typeform response ids unique on assessment attempts so the Typeform
+-- migration can bulk upsert attempts with on_conflict=typeform_response_id.
+-- NULLs (attempts not imported from Typeform) stay allowed in any number.
+
+-- Earlier migration runs could import the same response twice. Keep one
+-- attempt per response id (the one with the most answers, then the oldest)
+-- and drop the rest; their responses go with them via ON DELETE CASCADE.
+WITH ranked AS (
+    SELECT
+        a.id,
+        ROW_NUMBER() OVER (
+            PARTITION BY a.typeform_response_id
+            ORDER BY
+                (SELECT COUNT(*) FROM public.responses r WHERE r.attempt_id = a.id) DESC,
+                a.created_at,
+                a.id
+        ) AS position
+    FROM public.assessment_attempts a
+    WHERE a.typeform_response_id IS NOT NULL
+)
+DELETE FROM public.assessment_attempts a
+USING ranked
+WHERE a.id = ranked.id
+  AND ranked.position > 1;
+
+DROP INDEX IF EXISTS public.idx_attempts_typeform;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_attempts_typeform ON public.assessment_attempts(typeform_response_id);